@@ -0,0 +1,54 @@
+"""
+Script de build pour précompiler le noyau de niveau audio de LanVoice avec numba (AOT)
+Produit le module natif src/lanvoice_dsp pour éviter la compilation JIT au démarrage
+"""
+
+import math
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+
+def build_dsp_module():
+    """Compile le module natif lanvoice_dsp dans le dossier src"""
+    try:
+        from numba.pycc import CC
+    except ImportError as e:
+        print(f"❌ numba (pycc) indisponible: {e}")
+        print("   Installez numba avec: pip install numba")
+        return False
+
+    cc = CC('lanvoice_dsp')
+    cc.output_dir = SRC_DIR
+
+    # Noyau défini une seule fois dans src/dsp.py, exporté avec une signature fixe;
+    # src/dsp.py passe toujours un array contigu (np.ascontiguousarray)
+    # (une version précompilée existante n'est pas chargée: sous Windows le .pyd
+    # resterait verrouillé et ne pourrait pas être remplacé)
+    sys.modules['src.lanvoice_dsp'] = None
+    sys.modules['lanvoice_dsp'] = None
+    from src.dsp import rms_int16_kernel
+    del sys.modules['src.lanvoice_dsp'], sys.modules['lanvoice_dsp']
+    cc.export('rms_int16', 'f8(i2[::1])')(rms_int16_kernel)
+    
+    print("Compilation du module lanvoice_dsp...")
+    cc.compile()
+    print(f"✅ Module lanvoice_dsp créé dans {SRC_DIR}")
+    
+    # Vérifier l'export sur un array en lecture seule, comme ceux de np.frombuffer côté client
+    import numpy as np
+    sys.path.insert(0, SRC_DIR)
+    import lanvoice_dsp
+    try:
+        result = lanvoice_dsp.rms_int16(np.frombuffer(np.array([3, -4], dtype=np.int16).tobytes(), dtype=np.int16))
+    except Exception as e:
+        print(f"❌ L'export refuse les arrays en lecture seule: {e}")
+        return False
+    if abs(result - math.sqrt(12.5)) > 1e-6:
+        print(f"❌ Résultat inattendu du module compilé: {result}")
+        return False
+    print("✅ Export vérifié sur un array en lecture seule")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if build_dsp_module() else 1)
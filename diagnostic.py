@@ -13,10 +13,15 @@ import numpy as np
 from datetime import datetime
 
 class LanVoiceDiagnostic:
-    def __init__(self):
+    def __init__(self, out=None):
         self.results = []
         self.errors = []
         self.warnings = []
+        self.out = out  # Flux de sortie (None = sys.stdout)
+    
+    def _print(self, *args, **kwargs):
+        """print() vers le flux de sortie du diagnostic"""
+        print(*args, file=self.out, **kwargs)
         
     def log_result(self, test_name, status, details="", solution=""):
         """Enregistre le résultat d'un test"""
@@ -30,7 +35,7 @@ class LanVoiceDiagnostic:
         
     def test_audio_devices(self):
         """Teste la disponibilité des périphériques audio"""
-        print("🎵 Test des périphériques audio...")
+        self._print("🎵 Test des périphériques audio...")
         
         try:
             p = pyaudio.PyAudio()
@@ -76,7 +81,7 @@ class LanVoiceDiagnostic:
     
     def test_audio_latency(self):
         """Teste la latence audio avec différents buffers"""
-        print("⏱️ Test de latence audio...")
+        self._print("⏱️ Test de latence audio...")
         
         buffer_sizes = [256, 512, 1024, 2048, 4096]
         sample_rate = 44100
@@ -124,7 +129,7 @@ class LanVoiceDiagnostic:
     
     def test_network_connectivity(self):
         """Teste la connectivité réseau"""
-        print("🌐 Test de connectivité réseau...")
+        self._print("🌐 Test de connectivité réseau...")
         
         # Test de port disponible
         port = 12345
@@ -163,7 +168,7 @@ class LanVoiceDiagnostic:
     
     def test_system_performance(self):
         """Teste les performances système"""
-        print("🖥️ Test des performances système...")
+        self._print("🖥️ Test des performances système...")
         
         # CPU
         cpu_percent = psutil.cpu_percent(interval=1)
@@ -195,7 +200,7 @@ class LanVoiceDiagnostic:
     
     def test_audio_quality(self):
         """Teste la qualité audio avec un signal de test"""
-        print("🎼 Test de qualité audio...")
+        self._print("🎼 Test de qualité audio...")
         
         try:
             p = pyaudio.PyAudio()
@@ -274,9 +279,9 @@ class LanVoiceDiagnostic:
     
     def generate_report(self):
         """Génère un rapport de diagnostic complet"""
-        print("\n" + "="*60)
-        print("📋 RAPPORT DE DIAGNOSTIC LANVOICE")
-        print("="*60)
+        self._print("\n" + "="*60)
+        self._print("📋 RAPPORT DE DIAGNOSTIC LANVOICE")
+        self._print("="*60)
         
         # Résumé des statuts
         total_tests = len(self.results)
@@ -284,62 +289,62 @@ class LanVoiceDiagnostic:
         error_count = sum(1 for r in self.results if "❌" in r['status'])
         warning_count = sum(1 for r in self.results if "⚠️" in r['status'])
         
-        print(f"\n📊 RÉSUMÉ: {total_tests} tests effectués")
-        print(f"   ✅ Réussis: {ok_count}")
-        print(f"   ❌ Erreurs: {error_count}")
-        print(f"   ⚠️ Avertissements: {warning_count}")
+        self._print(f"\n📊 RÉSUMÉ: {total_tests} tests effectués")
+        self._print(f"   ✅ Réussis: {ok_count}")
+        self._print(f"   ❌ Erreurs: {error_count}")
+        self._print(f"   ⚠️ Avertissements: {warning_count}")
         
         # Détails des tests
-        print(f"\n📝 DÉTAILS DES TESTS:")
-        print("-" * 60)
+        self._print(f"\n📝 DÉTAILS DES TESTS:")
+        self._print("-" * 60)
         
         for result in self.results:
-            print(f"[{result['timestamp']}] {result['test']}: {result['status']}")
+            self._print(f"[{result['timestamp']}] {result['test']}: {result['status']}")
             if result['details']:
-                print(f"   📄 {result['details']}")
+                self._print(f"   📄 {result['details']}")
             if result['solution']:
-                print(f"   💡 Solution: {result['solution']}")
-            print()
+                self._print(f"   💡 Solution: {result['solution']}")
+            self._print()
         
         # Recommandations
-        print("🔧 RECOMMANDATIONS:")
-        print("-" * 60)
+        self._print("🔧 RECOMMANDATIONS:")
+        self._print("-" * 60)
         
         if error_count == 0 and warning_count == 0:
-            print("✅ Votre système est optimisé pour LanVoice!")
-            print("   Tous les tests sont réussis, vous devriez avoir d'excellentes performances.")
+            self._print("✅ Votre système est optimisé pour LanVoice!")
+            self._print("   Tous les tests sont réussis, vous devriez avoir d'excellentes performances.")
         elif error_count > 0:
-            print("❌ Des problèmes critiques ont été détectés:")
-            print("   Corrigez les erreurs ci-dessus avant d'utiliser LanVoice.")
+            self._print("❌ Des problèmes critiques ont été détectés:")
+            self._print("   Corrigez les erreurs ci-dessus avant d'utiliser LanVoice.")
         else:
-            print("🟡 Votre système fonctionne mais peut être optimisé:")
-            print("   Consultez les solutions proposées pour améliorer les performances.")
+            self._print("🟡 Votre système fonctionne mais peut être optimisé:")
+            self._print("   Consultez les solutions proposées pour améliorer les performances.")
         
         # Profil recommandé
         if error_count == 0:
             if ok_count >= total_tests * 0.9:
-                print("\n🎯 PROFIL RECOMMANDÉ: Ultra Low Latency")
-                print("   Votre système peut gérer la latence minimale (<3ms)")
+                self._print("\n🎯 PROFIL RECOMMANDÉ: Ultra Low Latency")
+                self._print("   Votre système peut gérer la latence minimale (<3ms)")
             elif warning_count <= 2:
-                print("\n🎯 PROFIL RECOMMANDÉ: Low Latency")
-                print("   Bon compromis performance/stabilité (~6ms)")
+                self._print("\n🎯 PROFIL RECOMMANDÉ: Low Latency")
+                self._print("   Bon compromis performance/stabilité (~6ms)")
             else:
-                print("\n🎯 PROFIL RECOMMANDÉ: Quality")
-                print("   Privilégie la stabilité et la qualité (~12ms)")
+                self._print("\n🎯 PROFIL RECOMMANDÉ: Quality")
+                self._print("   Privilégie la stabilité et la qualité (~12ms)")
         else:
-            print("\n🎯 PROFIL RECOMMANDÉ: Bandwidth Saving")
-            print("   Mode conservateur jusqu'à résolution des problèmes")
+            self._print("\n🎯 PROFIL RECOMMANDÉ: Bandwidth Saving")
+            self._print("   Mode conservateur jusqu'à résolution des problèmes")
         
-        print("\n" + "="*60)
-        print(f"Diagnostic terminé - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("="*60)
+        self._print("\n" + "="*60)
+        self._print(f"Diagnostic terminé - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self._print("="*60)
 
-def main():
-    """Fonction principale du diagnostic"""
-    print("🔍 LanVoice - Diagnostic Audio v2.0")
-    print("Analyse de votre système pour optimiser les performances audio...\n")
+def main(out=None):
+    """Fonction principale du diagnostic (out: flux de sortie, sys.stdout par défaut)"""
+    print("🔍 LanVoice - Diagnostic Audio v2.0", file=out)
+    print("Analyse de votre système pour optimiser les performances audio...\n", file=out)
     
-    diagnostic = LanVoiceDiagnostic()
+    diagnostic = LanVoiceDiagnostic(out)
     
     try:
         # Exécution des tests
@@ -353,10 +358,10 @@ def main():
         diagnostic.generate_report()
         
     except KeyboardInterrupt:
-        print("\n\n⚠️ Diagnostic interrompu par l'utilisateur")
+        print("\n\n⚠️ Diagnostic interrompu par l'utilisateur", file=out)
     except Exception as e:
-        print(f"\n\n❌ Erreur inattendue: {str(e)}")
-        print("Veuillez signaler ce problème avec les détails ci-dessus.")
+        print(f"\n\n❌ Erreur inattendue: {str(e)}", file=out)
+        print("Veuillez signaler ce problème avec les détails ci-dessus.", file=out)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,6 +3,9 @@ Configuration audio optimisée pour LanVoice
 Paramètres ajustés pour minimiser la latence tout en préservant la qualité vocale
 """
 
+import functools
+import types
+
 import pyaudio
 
 class AudioConfig:
@@ -13,17 +16,17 @@ class AudioConfig:
     # ========================================
     
     # Profil Ultra Faible Latence (< 10ms)
-    ULTRA_LOW_LATENCY = {
+    ULTRA_LOW_LATENCY = types.MappingProxyType({
         'CHUNK': 128,           # 2.9ms de latence à 44100 Hz
         'FORMAT': pyaudio.paInt16,
         'CHANNELS': 1,
         'RATE': 44100,
         'BUFFER_SIZE': 256,     # Buffer réseau réduit
         'DESCRIPTION': 'Ultra faible latence - Idéal pour LAN rapide'
-    }
+    })
     
     # Profil Ultra Minimal (< 1ms) - PHASE 1 OPTIMISATION
-    ULTRA_MINIMAL_LATENCY = {
+    ULTRA_MINIMAL_LATENCY = types.MappingProxyType({
         'CHUNK': 64,            # 1.45ms de latence à 44100 Hz, 1.33ms à 48000 Hz
         'FORMAT': pyaudio.paInt16,
         'CHANNELS': 1,
@@ -33,37 +36,37 @@ class AudioConfig:
         'REALTIME_PRIORITY': True,
         'CPU_AFFINITY': True,
         'CALLBACK_MODE': True
-    }
+    })
     
     # Profil Faible Latence (< 20ms)
-    LOW_LATENCY = {
+    LOW_LATENCY = types.MappingProxyType({
         'CHUNK': 256,           # 5.8ms de latence à 44100 Hz
         'FORMAT': pyaudio.paInt16,
         'CHANNELS': 1,
         'RATE': 44100,
         'BUFFER_SIZE': 512,
         'DESCRIPTION': 'Faible latence - Équilibre optimal'
-    }
+    })
     
     # Profil Qualité (< 50ms)
-    QUALITY = {
+    QUALITY = types.MappingProxyType({
         'CHUNK': 512,           # 11.6ms de latence à 44100 Hz
         'FORMAT': pyaudio.paInt16,
         'CHANNELS': 1,
         'RATE': 44100,
         'BUFFER_SIZE': 1024,
         'DESCRIPTION': 'Qualité audio - Plus stable'
-    }
+    })
     
     # Profil Économie Bande Passante
-    BANDWIDTH_SAVING = {
+    BANDWIDTH_SAVING = types.MappingProxyType({
         'CHUNK': 256,
         'FORMAT': pyaudio.paInt16,
         'CHANNELS': 1,
         'RATE': 22050,          # Réduction 50% bande passante
         'BUFFER_SIZE': 512,
         'DESCRIPTION': 'Économie bande passante - Connexions lentes'
-    }
+    })
     
     # ========================================
     # PROFIL PAR DÉFAUT
@@ -73,17 +76,26 @@ class AudioConfig:
     @classmethod
     def get_latency_ms(cls, config):
         """Calcule la latence théorique en millisecondes"""
-        samples_per_chunk = config['CHUNK']
-        sample_rate = config['RATE']
-        latency_ms = (samples_per_chunk / sample_rate) * 1000
-        return round(latency_ms, 1)
+        return cls._latency_ms(config['CHUNK'], config['RATE'])
     
     @classmethod
     def get_bandwidth_kbps(cls, config):
         """Calcule la bande passante théorique en kbps"""
+        return cls._bandwidth_kbps(config['RATE'], config['CHANNELS'], config['FORMAT'])
+    
+    # Calculs mis en cache par valeurs (les profils ne sont pas hachables)
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _latency_ms(samples_per_chunk, sample_rate):
+        latency_ms = (samples_per_chunk / sample_rate) * 1000
+        return round(latency_ms, 1)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _bandwidth_kbps(sample_rate, channels, sample_format):
         # paInt16 = 2 bytes par échantillon
-        bytes_per_sample = 2 if config['FORMAT'] == pyaudio.paInt16 else 4
-        bytes_per_second = config['RATE'] * config['CHANNELS'] * bytes_per_sample
+        bytes_per_sample = 2 if sample_format == pyaudio.paInt16 else 4
+        bytes_per_second = sample_rate * channels * bytes_per_sample
         kbps = (bytes_per_second * 8) / 1000
         return round(kbps, 1)
     
@@ -337,12 +349,15 @@ class LockFreeRingBuffer:
         if data_len > self.size - self._available:
             # Buffer plein, ignorer les données anciennes (comportement temps-réel)
             return False
-            
-        # Écriture atomique circulaire
-        for byte in data:
-            self.buffer[self.write_pos] = byte
-            self.write_pos = (self.write_pos + 1) % self.size
-            
+        
+        # Écriture circulaire en au plus deux copies de tranches (memcpy côté C)
+        pos = self.write_pos
+        first = min(data_len, self.size - pos)
+        self.buffer[pos:pos + first] = data[:first]
+        if first < data_len:
+            self.buffer[:data_len - first] = data[first:]
+        self.write_pos = (pos + data_len) % self.size
+        
         self._available += data_len
         return True
     
@@ -354,11 +369,14 @@ class LockFreeRingBuffer:
             
         if length == 0:
             return bytearray()
-            
-        result = bytearray(length)
-        for i in range(length):
-            result[i] = self.buffer[self.read_pos]
-            self.read_pos = (self.read_pos + 1) % self.size
+        
+        # Lecture circulaire en au plus deux copies de tranches
+        pos = self.read_pos
+        first = min(length, self.size - pos)
+        result = self.buffer[pos:pos + first]
+        if first < length:
+            result += self.buffer[:length - first]
+        self.read_pos = (pos + length) % self.size
             
         self._available -= length
         return result
@@ -10,10 +10,15 @@ import struct
 import pyaudio
 import numpy as np
 import math
-import zlib
 from collections import deque
 from typing import Optional, Callable
 
+# Implémentation ISA-L de zlib si disponible (même format, compression niveau 1 plus rapide)
+try:
+    from isal import isal_zlib as zlib
+except ImportError:
+    import zlib
+
 # Utiliser le système de logging centralisé
 try:
     from src.logger import get_logger
@@ -29,6 +34,12 @@ try:
 except ImportError:
     get_config_manager = None
 
+# Noyau de calcul du niveau audio partagé (compilé avec numba si disponible)
+try:
+    from src.dsp import rms_int16
+except ImportError:
+    from dsp import rms_int16
+
 # Import des optimisations PHASE 1
 try:
     from src.audio_config import AudioOptimizer, UltraMinimalCallback, LockFreeRingBuffer, AudioConfig
@@ -84,8 +95,8 @@ class VoiceClient:
         self.lock = threading.Lock()
         
         # VU-mètre et threshold
-        self.audio_level = 0.0  # Niveau audio actuel (0-100)
-        self.threshold = 10.0   # Seuil en pourcentage (0-100)
+        self.audio_level = 0.0  # Niveau audio actuel (dB, -60 à 0)
+        self.threshold = 10.0   # Seuil en dB (remplacé par la configuration VOX)
         self.vox_enabled = False  # Voice activation
         self.vox_active = False   # État actuel du VOX
         self.level_callback: Optional[Callable] = None  # Callback pour mettre à jour le VU-mètre
@@ -132,6 +143,21 @@ class VoiceClient:
         logger.info(f"   • Sample Rate: {self.RATE} Hz")
         logger.info(f"   • Compression: {'Activée' if self.use_compression else 'Désactivée'}")
         logger.debug(f"Configuration détaillée - Format: {self.FORMAT}, Channels: {self.CHANNELS}, Buffer: {self.BUFFER_SIZE}")
+    
+    @classmethod
+    def for_testing(cls):
+        """Client réduit à l'état VU-mètre/VOX, sans configuration, audio ni réseau (tests)"""
+        self = cls.__new__(cls)
+        self.connected = False
+        self.recording = False
+        self.playing = False
+        self.audio_level = 0.0
+        self.threshold = 0.0
+        self.vox_enabled = False
+        self.vox_active = False
+        self.level_callback = None
+        self.vox_callback = None
+        return self
         
     def _apply_user_config(self):
         """Applique la configuration utilisateur personnalisée"""
@@ -703,14 +729,17 @@ class VoiceClient:
             'port': self.port
         }
     
-    def calculate_rms_level(self, audio_data: bytes) -> float:
-        """Calcule le niveau RMS de l'audio en décibels (dB)"""
+    def calculate_rms_level(self, audio_data) -> float:
+        """Calcule le niveau RMS de l'audio en décibels (dB) à partir de bytes ou d'un array int16"""
         try:
-            # Convertir les bytes en array numpy
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
+            # Un array numpy est utilisé tel quel, les bytes sont vus sans copie
+            if isinstance(audio_data, np.ndarray):
+                audio_array = audio_data
+            else:
+                audio_array = np.frombuffer(audio_data, dtype=np.int16)
             
-            # Calculer le RMS
-            rms = np.sqrt(np.mean(audio_array.astype(np.float32) ** 2))
+            # Calculer le RMS (noyau compilé si numba est disponible)
+            rms = rms_int16(audio_array)
             
             # Convertir en dB
             if rms > 0:
@@ -735,8 +764,8 @@ class VoiceClient:
         return self.audio_level > self.threshold
     
     def set_threshold(self, threshold: float):
-        """Définit le seuil de déclenchement (0-100)"""
-        self.threshold = max(0, min(100, threshold))
+        """Définit le seuil de déclenchement en dB (-60 à 0, comme calculate_rms_level)"""
+        self.threshold = max(-60.0, min(0.0, threshold))
     
     def set_vox_enabled(self, enabled: bool):
         """Active/désactive le mode VOX"""
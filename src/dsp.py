@@ -0,0 +1,100 @@
+"""
+Noyaux de traitement du signal partagés par LanVoice
+Calcul du niveau audio précompilé (build_dsp.py) ou compilé avec numba si disponible, repli NumPy sinon
+"""
+
+import logging
+import math
+
+import numpy as np
+
+# Logger de la hiérarchie LanVoice, sans initialiser le système de logging à l'import
+# (ce module est aussi importé par build_dsp.py)
+logger = logging.getLogger('LanVoice.DSP')
+
+# Module natif précompilé par build_dsp.py (optionnel, aucune compilation au démarrage)
+try:
+    from src.lanvoice_dsp import rms_int16 as _aot_rms_int16
+except ImportError:
+    try:
+        from lanvoice_dsp import rms_int16 as _aot_rms_int16
+    except ImportError:
+        _aot_rms_int16 = None
+
+# Accélération optionnelle du calcul de niveau (numba n'est pas une dépendance requise)
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+def rms_int16_kernel(samples):
+    """RMS d'un bloc int16 en une seule passe (carré, somme, racine)
+    
+    Source unique du noyau: compilé à la demande par numba ci-dessous et
+    exporté tel quel par build_dsp.py pour le module précompilé.
+    """
+    n = samples.shape[0]
+    if n == 0:
+        return 0.0
+    acc = 0.0
+    for i in range(n):
+        v = float(samples[i])
+        acc += v * v
+    return math.sqrt(acc / n)
+
+if _aot_rms_int16 is not None:
+    # Vérifier le module natif sur un array en lecture seule issu de np.frombuffer,
+    # comme ceux du client (RMS attendu de [3, -4]: sqrt(12.5))
+    try:
+        _check = _aot_rms_int16(np.frombuffer(np.array([3, -4], dtype=np.int16).tobytes(), dtype=np.int16))
+        if abs(_check - math.sqrt(12.5)) > 1e-6:
+            raise ValueError(f"résultat inattendu {_check}")
+    except Exception as e:
+        logger.warning(f"Module lanvoice_dsp inutilisable, repli sur numba/NumPy: {e}")
+        _aot_rms_int16 = None
+
+if _aot_rms_int16 is not None:
+    RMS_BACKEND = "aot"
+    
+    def rms_int16(samples):
+        """RMS d'un bloc int16 (module précompilé, export limité aux arrays contigus)"""
+        return _aot_rms_int16(np.ascontiguousarray(samples, dtype=np.int16))
+elif njit is not None:
+    RMS_BACKEND = "numba"
+    rms_int16 = njit(cache=True, fastmath=True, boundscheck=False)(rms_int16_kernel)
+else:
+    RMS_BACKEND = "numpy"
+    
+    def rms_int16(samples):
+        """RMS d'un bloc int16 (repli NumPy sans numba)"""
+        if len(samples) == 0:
+            return 0.0
+        # Une seule conversion, somme des carrés par produit scalaire (pas de tableau des carrés)
+        a = samples.astype(np.float64, copy=False)
+        return float(np.sqrt(np.dot(a, a) / a.size))
+
+logger.info(f"Calcul du niveau audio: backend {RMS_BACKEND}")
+
+if njit is not None:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def rms_int16_batch(frames):
+        """RMS de chaque ligne d'une matrice (F, N) int16, lignes réparties sur les cœurs"""
+        count, n = frames.shape
+        out = np.zeros(count, dtype=np.float64)
+        if n == 0:
+            return out
+        for row in prange(count):
+            acc = 0.0
+            for i in range(n):
+                v = float(frames[row, i])
+                acc += v * v
+            out[row] = math.sqrt(acc / n)
+        return out
+else:
+    def rms_int16_batch(frames):
+        """RMS de chaque ligne d'une matrice (F, N) int16 (repli NumPy sans numba)"""
+        if frames.shape[1] == 0:
+            return np.zeros(frames.shape[0], dtype=np.float64)
+        samples = frames.astype(np.float64)
+        # Somme des carrés par ligne sans matérialiser la matrice des carrés
+        return np.sqrt(np.einsum('ij,ij->i', samples, samples) / frames.shape[1])
@@ -6,6 +6,8 @@ Crée un nouveau fichier de log à chaque démarrage de l'application
 import logging
 import os
 import sys
+import atexit
+import queue
 from datetime import datetime
 
 # Import conditionnel pour PyInstaller
@@ -15,6 +17,12 @@ try:
 except ImportError:
     HAS_ROTATING_HANDLER = False
 
+try:
+    from logging.handlers import QueueHandler, QueueListener
+    HAS_QUEUE_HANDLER = True
+except ImportError:
+    HAS_QUEUE_HANDLER = False
+
 class LanVoiceLogger:
     def __init__(self, log_dir="logs", max_files=10):
         """
@@ -27,6 +35,8 @@ class LanVoiceLogger:
         self.log_dir = log_dir
         self.max_files = max_files
         self.log_file = None
+        self.listener = None
+        self.queue_handler = None
         
         # Créer le dossier de logs s'il n'existe pas
         if not os.path.exists(log_dir):
@@ -114,10 +124,21 @@ class LanVoiceLogger:
         for handler in root_logger.handlers[:]:
             root_logger.removeHandler(handler)
         
-        # Ajouter nos handlers
-        if file_handler:
-            root_logger.addHandler(file_handler)
-        root_logger.addHandler(console_handler)
+        handlers = [file_handler, console_handler] if file_handler else [console_handler]
+        
+        if HAS_QUEUE_HANDLER:
+            # Écriture asynchrone: l'appelant (ex. thread audio) ne fait que déposer
+            # l'enregistrement dans la file, le formatage et les E/S se font dans un thread dédié
+            log_queue = queue.SimpleQueue()
+            self.queue_handler = QueueHandler(log_queue)
+            root_logger.addHandler(self.queue_handler)
+            self.listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            self.listener.start()
+            atexit.register(self.stop)
+        else:
+            # Ajouter nos handlers
+            for handler in handlers:
+                root_logger.addHandler(handler)
         
         # Logger spécifique pour LanVoice
         self.logger = logging.getLogger('LanVoice')
@@ -129,6 +150,21 @@ class LanVoiceLogger:
         self.logger.info(f"Fichier de log: {self.log_file}")
         self.logger.info(f"Niveau de log: DEBUG")
     
+    def stop(self):
+        """Vide la file de logs et arrête le thread d'écriture; les logs suivants
+        sont écrits directement par les handlers (plus rien n'est mis en file)"""
+        if self.listener is not None:
+            root_logger = logging.getLogger()
+            # Handlers rattachés avant de retirer la file: aucun log n'est perdu entre les deux
+            for handler in self.listener.handlers:
+                root_logger.addHandler(handler)
+            root_logger.removeHandler(self.queue_handler)
+            self.queue_handler = None
+            
+            # Écrit les logs encore en file puis arrête le thread
+            self.listener.stop()
+            self.listener = None
+    
     def get_logger(self, name=None):
         """Retourne un logger avec le nom spécifié"""
         if name:
@@ -271,4 +307,11 @@ def log_startup_complete():
     """Marque la fin de l'initialisation"""
     global _lanvoice_logger
     if _lanvoice_logger:
-        _lanvoice_logger.log_startup_complete()
\ No newline at end of file
+        _lanvoice_logger.log_startup_complete()
+
+def stop_logging():
+    """Vide la file de logs dans les fichiers (à appeler avant de relire le log);
+    la journalisation continue ensuite en écriture directe"""
+    global _lanvoice_logger
+    if _lanvoice_logger:
+        _lanvoice_logger.stop()
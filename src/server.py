@@ -6,9 +6,14 @@ import socket
 import threading
 import time
 import struct
-import zlib
 from typing import Dict, Set
 
+# Implémentation ISA-L de zlib si disponible (même format, compression niveau 1 plus rapide)
+try:
+    from isal import isal_zlib as zlib
+except ImportError:
+    import zlib
+
 # Utiliser le système de logging centralisé
 try:
     from src.logger import get_logger
@@ -32,6 +37,9 @@ class VoiceServer:
         self.running = False
         self.lock = threading.Lock()
         
+        # Signalé dès que le socket écoute (ou que le démarrage a échoué)
+        self.ready = threading.Event()
+        
         # Gestionnaire de configuration
         self.config_manager = get_config_manager() if get_config_manager else None
         
@@ -112,6 +120,7 @@ class VoiceServer:
             logger.debug("Socket en mode écoute (backlog: 10)")
             
             self.running = True
+            self.ready.set()
             
             logger.info(f"✅ Serveur vocal démarré avec succès sur {self.host}:{self.port}")
             logger.info("En attente de connexions...")
@@ -162,6 +171,8 @@ class VoiceServer:
             raise
         finally:
             self.stop()
+            # Débloquer les threads qui attendent le démarrage, même en cas d'échec
+            self.ready.set()
     
     def handle_client(self, client_socket: socket.socket, address):
         """Gère un client connecté"""
@@ -5,17 +5,143 @@ Fenêtre de configuration avec contrôles audio, VOX et diagnostic
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+from tkinter import font as tkfont
 import threading
 import subprocess
 import sys
 import os
+import io
+import socket
+import time
+import math
+import tempfile
+import importlib.util
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+import psutil
+
+# PyAudio (PortAudio) peut manquer: la fenêtre reste utilisable sans les tests audio
+try:
+    import pyaudio
+except ImportError:
+    pyaudio = None
+
+# Noyau de calcul du niveau audio partagé (compilé avec numba si disponible)
+try:
+    from src.dsp import rms_int16
+except ImportError:
+    from dsp import rms_int16
+
+# Facteur de normalisation int16 -> [0, 1] (évite une division par chunk)
+_INV_32768 = 1.0 / 32768.0
+
+# Inverse de la référence 0 dB (int16 max) pour passer du RMS aux dB
+_INV_REF = 1.0 / 32767.0
+
+# Plancher du VU-mètre (-60 dB) en amplitude linéaire et en RMS int16
+_VU_FLOOR = 10 ** (-60.0 / 20)
+_RMS_FLOOR = 32767.0 * _VU_FLOOR
+
+# Types de widgets qui supportent l'option 'state'
+_STATEFUL_WIDGETS = (ttk.Entry, ttk.Combobox, ttk.Scale, ttk.Checkbutton,
+                     ttk.Button, ttk.Radiobutton, ttk.Spinbox)
+
+# (fréquence d'échantillonnage, taille du buffer) associés à chaque profil audio
+_PROFILE_SETTINGS = {
+    "ultra_minimal_latency": (48000, 128),
+    "ultra_low_latency": (44100, 512),
+    "low_latency": (44100, 1024),
+    "quality": (44100, 2048),
+    "bandwidth_saving": (22050, 4096)
+}
+
+# Profils vérifiés par le test audio rapide: (nom, fréquence, buffer, latence en ms)
+_AUDIO_TEST_PROFILES = tuple(
+    (name, rate, buffer, buffer / rate * 1000.0)
+    for name, rate, buffer in (("Ultra Low", 44100, 512),
+                               ("Low Latency", 44100, 1024),
+                               ("Quality", 44100, 2048))
+)
+
+# Threads réutilisés pour les tâches de fond (diagnostic, réseau, test audio, auto-config):
+# pool créé à la demande et arrêté à la destruction de la fenêtre, tâches en attente annulées
+_background_pool = None
+_background_pool_lock = threading.Lock()
+
+def _submit_background(task):
+    """Exécute task sur le pool de fond (créé au premier appel)"""
+    global _background_pool
+    with _background_pool_lock:
+        if _background_pool is None:
+            _background_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="SettingsBG")
+        return _background_pool.submit(task)
+
+def _shutdown_background_pool():
+    """Arrête le pool de fond sans attendre, en abandonnant les tâches pas encore démarrées"""
+    global _background_pool
+    with _background_pool_lock:
+        pool, _background_pool = _background_pool, None
+    if pool is not None:
+        if sys.version_info >= (3, 9):
+            pool.shutdown(wait=False, cancel_futures=True)
+        else:
+            pool.shutdown(wait=False)
+
+class _DiagnosticStream(io.TextIOBase):
+    """Flux texte qui transmet chaque écriture à un callback (sortie du diagnostic)"""
+    
+    def __init__(self, emit):
+        self._emit = emit
+    
+    def writable(self):
+        return True
+    
+    def write(self, text):
+        if text:
+            self._emit(text)
+        return len(text)
+
 class SettingsWindow:
     """Fenêtre des paramètres avancés"""
     
+    # Correspondance (clé de configuration, clé de variable Tk) appliquée par apply_settings
+    _CONFIG_VARS = (
+        # Audio
+        ("custom_sample_rate", "sample_rate"),
+        ("custom_buffer_size", "buffer_size"),
+        ("compression_enabled", "compression_enabled"),
+        ("compression_level", "compression_level"),
+        
+        # VOX
+        ("vox_enabled", "vox_enabled"),
+        ("vox_threshold", "vox_threshold"),
+        ("vox_delay", "vox_delay"),
+        ("vox_hangtime", "vox_hangtime"),
+        
+        # Réseau
+        ("server_port", "server_port"),
+        ("connection_timeout", "connection_timeout"),
+        ("tcp_nodelay", "tcp_nodelay"),
+        ("network_optimization", "network_optimization"),
+        
+        # Diagnostic
+        ("auto_diagnostic", "auto_diagnostic"),
+        
+        # Avancé
+        ("thread_priority", "thread_priority"),
+        ("cpu_optimization", "cpu_optimization"),
+        ("memory_optimization", "memory_optimization"),
+        ("experimental_features", "experimental_features"),
+        ("log_level", "log_level"),
+        ("theme", "theme"),
+        ("show_performance_metrics", "show_performance_metrics")
+    )
+    
     def __init__(self, parent, config_manager):
         """
         Initialise la fenêtre des paramètres
@@ -30,6 +156,23 @@ class SettingsWindow:
         self.diagnostic_window = None
         self.vars = {}
         
+        # Instance PyAudio partagée (monitoring, test audio) pendant toute la vie de la fenêtre
+        self._pa_inst = None
+        self._pa_lock = threading.Lock()
+        self.audio_stream = None
+        self._level_tick_id = None
+        
+        # Script de diagnostic résolu une seule fois (None si introuvable)
+        candidates = [Path(__file__).resolve().parent.parent / "diagnostic.py",
+                      Path.cwd() / "diagnostic.py"]
+        self._diagnostic_path = next((path for path in candidates if path.exists()), None)
+        self._diagnostic_running = False
+        
+        # Dernier affichage du VU-mètre (évite les appels Tk redondants)
+        self._last_db_i = None
+        self._last_color = None
+        self._last_level = None
+        
         # Profils audio disponibles
         self.audio_profiles = {
             "auto": "🤖 Détection Automatique",
@@ -39,6 +182,10 @@ class SettingsWindow:
             "quality": "🎵 Quality (~11.6ms)",
             "bandwidth_saving": "💾 Bandwidth Saving (~23.2ms)"
         }
+        
+        # Index inverse texte affiché -> clé de profil, et valeurs de la combobox
+        self._profile_display_to_key = {v: k for k, v in self.audio_profiles.items()}
+        self._profile_values = tuple(self.audio_profiles.values())
     
     def show(self):
         """Affiche la fenêtre des paramètres"""
@@ -51,6 +198,10 @@ class SettingsWindow:
         self.window.title("⚙️ Paramètres Avancés - LanVoice v2.0")
         self.window.geometry("800x700")
         self.window.resizable(True, True)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        # Destruction par cancel() ou avec la fenêtre principale à la sortie de l'application
+        self.window.bind('<Destroy>', self._on_destroy, add='+')
         
         # Icône de la fenêtre
         try:
@@ -62,6 +213,12 @@ class SettingsWindow:
         self.window.columnconfigure(0, weight=1)
         self.window.rowconfigure(0, weight=1)
         
+        # Polices partagées par tous les onglets (résolues une seule fois par Tk)
+        self._font_title = tkfont.Font(self.window, family="Arial", size=12, weight="bold")
+        self._font_section = tkfont.Font(self.window, family="Arial", size=10, weight="bold")
+        self._font_info = tkfont.Font(self.window, family="Arial", size=8)
+        self._font_note = tkfont.Font(self.window, family="Arial", size=9)
+        
         # Création du notebook pour les onglets
         self.notebook = ttk.Notebook(self.window)
         self.notebook.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
@@ -93,7 +250,7 @@ class SettingsWindow:
         row = 0
         
         # Titre
-        title_label = ttk.Label(audio_frame, text="Paramètres Audio", font=("Arial", 12, "bold"))
+        title_label = ttk.Label(audio_frame, text="Paramètres Audio", font=self._font_title)
         title_label.grid(row=row, column=0, columnspan=2, pady=(10, 20), sticky="w")
         row += 1
         
@@ -101,7 +258,7 @@ class SettingsWindow:
         ttk.Label(audio_frame, text="Profil Audio:").grid(row=row, column=0, sticky="w", padx=(10, 5), pady=5)
         self.vars['audio_profile'] = tk.StringVar()
         profile_combo = ttk.Combobox(audio_frame, textvariable=self.vars['audio_profile'], 
-                                   values=list(self.audio_profiles.values()), 
+                                   values=self._profile_values, 
                                    state="readonly", width=40)
         profile_combo.grid(row=row, column=1, sticky="ew", padx=(5, 10), pady=5)
         profile_combo.bind('<<ComboboxSelected>>', self.on_profile_change)
@@ -113,7 +270,7 @@ class SettingsWindow:
         row += 1
         
         # Paramètres personnalisés
-        custom_label = ttk.Label(audio_frame, text="Paramètres Personnalisés", font=("Arial", 10, "bold"))
+        custom_label = ttk.Label(audio_frame, text="Paramètres Personnalisés", font=self._font_section)
         custom_label.grid(row=row, column=0, columnspan=2, pady=(0, 10), sticky="w", padx=10)
         row += 1
         
@@ -131,16 +288,10 @@ class SettingsWindow:
         sample_rate_label.grid(row=0, column=1, padx=(10, 0))
         
         # Presets pour sample rate
-        preset_frame = ttk.Frame(sample_rate_frame)
-        preset_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(5, 0))
-        ttk.Button(preset_frame, text="8kHz", width=6, 
-                  command=lambda: self.vars['sample_rate'].set(8000)).pack(side="left", padx=2)
-        ttk.Button(preset_frame, text="22kHz", width=6,
-                  command=lambda: self.vars['sample_rate'].set(22050)).pack(side="left", padx=2)
-        ttk.Button(preset_frame, text="44kHz", width=6,
-                  command=lambda: self.vars['sample_rate'].set(44100)).pack(side="left", padx=2)
-        ttk.Button(preset_frame, text="48kHz", width=6,
-                  command=lambda: self.vars['sample_rate'].set(48000)).pack(side="left", padx=2)
+        sample_rate_presets = ttk.Combobox(sample_rate_frame, values=["8000", "22050", "44100", "48000"],
+                                         state="readonly", width=8)
+        sample_rate_presets.grid(row=1, column=0, sticky="w", pady=(5, 0))
+        sample_rate_presets.bind('<<ComboboxSelected>>', partial(self._apply_preset, 'sample_rate'))
         row += 1
         
         # Taille du buffer
@@ -157,16 +308,10 @@ class SettingsWindow:
         buffer_label.grid(row=0, column=1, padx=(10, 0))
         
         # Presets pour buffer size
-        buffer_preset_frame = ttk.Frame(buffer_frame)
-        buffer_preset_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(5, 0))
-        ttk.Button(buffer_preset_frame, text="256", width=6,
-                  command=lambda: self.vars['buffer_size'].set(256)).pack(side="left", padx=2)
-        ttk.Button(buffer_preset_frame, text="512", width=6,
-                  command=lambda: self.vars['buffer_size'].set(512)).pack(side="left", padx=2)
-        ttk.Button(buffer_preset_frame, text="1024", width=6,
-                  command=lambda: self.vars['buffer_size'].set(1024)).pack(side="left", padx=2)
-        ttk.Button(buffer_preset_frame, text="2048", width=6,
-                  command=lambda: self.vars['buffer_size'].set(2048)).pack(side="left", padx=2)
+        buffer_presets = ttk.Combobox(buffer_frame, values=["256", "512", "1024", "2048"],
+                                    state="readonly", width=8)
+        buffer_presets.grid(row=1, column=0, sticky="w", pady=(5, 0))
+        buffer_presets.bind('<<ComboboxSelected>>', partial(self._apply_preset, 'buffer_size'))
         row += 1
         
         # Séparateur
@@ -175,7 +320,7 @@ class SettingsWindow:
         row += 1
         
         # Compression
-        compression_label = ttk.Label(audio_frame, text="Compression Audio", font=("Arial", 10, "bold"))
+        compression_label = ttk.Label(audio_frame, text="Compression Audio", font=self._font_section)
         compression_label.grid(row=row, column=0, columnspan=2, pady=(0, 10), sticky="w", padx=10)
         row += 1
         
@@ -194,10 +339,13 @@ class SettingsWindow:
         row += 1
         
         # Info compression
-        info_frame = ttk.Frame(audio_frame)
-        info_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 10))
         info_text = "💡 Niveau 1: Rapide, faible compression | Niveau 9: Lent, compression maximale"
-        ttk.Label(info_frame, text=info_text, foreground="gray", font=("Arial", 8)).pack()
+        ttk.Label(audio_frame, text=info_text, foreground="gray", font=self._font_info,
+                  anchor="center").grid(row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 10))
+    
+    def _apply_preset(self, key, event):
+        """Applique la valeur de preset choisie dans une combobox à la variable associée"""
+        self.vars[key].set(int(event.widget.get()))
     
     def create_vox_tab(self):
         """Crée l'onglet des paramètres VOX"""
@@ -209,7 +357,7 @@ class SettingsWindow:
         row = 0
         
         # Titre
-        title_label = ttk.Label(vox_frame, text="Voice Activated Transmission (VOX)", font=("Arial", 12, "bold"))
+        title_label = ttk.Label(vox_frame, text="Voice Activated Transmission (VOX)", font=self._font_title)
         title_label.grid(row=row, column=0, columnspan=2, pady=(10, 20), sticky="w")
         row += 1
         
@@ -242,11 +390,9 @@ class SettingsWindow:
         self.threshold_label = ttk.Label(threshold_frame, text="-30 dB")
         self.threshold_label.grid(row=0, column=1, padx=(10, 0))
         
-        # Mise à jour de l'affichage du seuil
-        def update_threshold_display(*args):
-            value = self.vars['vox_threshold'].get()
-            self.threshold_label.config(text=f"{value:.0f} dB")
-        self.vars['vox_threshold'].trace('w', update_threshold_display)
+        # Mise à jour de l'affichage du seuil (regroupée par cycle idle de Tk)
+        self._threshold_pending = False
+        self.vars['vox_threshold'].trace('w', self._on_threshold_change)
         vox_row += 1
         
         # Délai d'activation
@@ -265,31 +411,49 @@ class SettingsWindow:
         hangtime_scale.grid(row=vox_row, column=1, sticky="ew", pady=5)
         vox_row += 1
         
+        self._cache_vox_stateful_widgets()
+        
         # Indicateur de niveau audio
         level_frame = ttk.LabelFrame(vox_frame, text="Niveau Audio en Temps Réel", padding=10)
         level_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=10)
         level_frame.columnconfigure(0, weight=1)
         
-        self.audio_level_var = tk.DoubleVar()
-        self.audio_level_bar = ttk.Progressbar(level_frame, variable=self.audio_level_var, 
-                                             maximum=0.1, mode='determinate')
+        # VU-mètre dessiné sur un Canvas: une seule forme dont on modifie les coordonnées
+        self.audio_level_bar = tk.Canvas(level_frame, height=16, bg="black", highlightthickness=0)
         self.audio_level_bar.grid(row=0, column=0, sticky="ew", pady=5)
+        self._level_rect = self.audio_level_bar.create_rectangle(0, 0, 0, 16, fill="#4CAF50", width=0)
         
         self.level_label = ttk.Label(level_frame, text="Niveau: 0.000")
         self.level_label.grid(row=1, column=0, pady=5)
         
         # Bouton de test VOX
-        test_button = ttk.Button(level_frame, text="🎤 Test VOX en Temps Réel", 
-                               command=self.start_vox_test)
-        test_button.grid(row=2, column=0, pady=10)
+        self.vox_button = ttk.Button(level_frame, text="🎤 Test VOX en Temps Réel", 
+                                     command=self.start_vox_test)
+        self.vox_button.grid(row=2, column=0, pady=10)
         
         # Instructions
         info_text = ("💡 Le VOX active automatiquement la transmission quand le niveau audio "
                     "dépasse le seuil défini. Ajustez le seuil selon votre environnement.")
         info_label = ttk.Label(vox_frame, text=info_text, wraplength=750, 
-                             foreground="gray", font=("Arial", 9))
+                             foreground="gray", font=self._font_note)
         info_label.grid(row=row+1, column=0, columnspan=2, padx=10, pady=10, sticky="w")
     
+    def _on_threshold_change(self, *args):
+        """Programme une seule mise à jour du libellé du seuil par cycle idle"""
+        if self._threshold_pending:
+            return
+        self._threshold_pending = True
+        self.window.after_idle(self._flush_threshold)
+    
+    def _flush_threshold(self):
+        """Affiche la valeur courante du seuil VOX"""
+        self._threshold_pending = False
+        try:
+            value = self.vars['vox_threshold'].get()
+            self.threshold_label.config(text=f"{value:.0f} dB")
+        except tk.TclError:
+            pass  # Fenêtre fermée entre-temps
+    
     def create_network_tab(self):
         """Crée l'onglet des paramètres réseau"""
         network_frame = ttk.Frame(self.notebook)
@@ -300,7 +464,7 @@ class SettingsWindow:
         row = 0
         
         # Titre
-        title_label = ttk.Label(network_frame, text="Paramètres Réseau", font=("Arial", 12, "bold"))
+        title_label = ttk.Label(network_frame, text="Paramètres Réseau", font=self._font_title)
         title_label.grid(row=row, column=0, columnspan=2, pady=(10, 20), sticky="w")
         row += 1
         
@@ -328,7 +492,7 @@ class SettingsWindow:
         row += 1
         
         # Optimisations réseau
-        ttk.Label(network_frame, text="Optimisations Réseau", font=("Arial", 10, "bold")).grid(
+        ttk.Label(network_frame, text="Optimisations Réseau", font=self._font_section).grid(
             row=row, column=0, columnspan=2, pady=(20, 10), sticky="w", padx=10)
         row += 1
         
@@ -359,7 +523,7 @@ class SettingsWindow:
         diagnostic_frame.rowconfigure(1, weight=1)
         
         # Titre et description
-        title_label = ttk.Label(diagnostic_frame, text="Diagnostic Système", font=("Arial", 12, "bold"))
+        title_label = ttk.Label(diagnostic_frame, text="Diagnostic Système", font=self._font_title)
         title_label.grid(row=0, column=0, pady=(10, 5), sticky="w")
         
         desc_label = ttk.Label(diagnostic_frame, 
@@ -367,17 +531,19 @@ class SettingsWindow:
                              foreground="gray")
         desc_label.grid(row=0, column=0, pady=(0, 20), sticky="w")
         
-        # Zone de résultats
-        self.diagnostic_text = scrolledtext.ScrolledText(diagnostic_frame, height=25, wrap=tk.WORD)
-        self.diagnostic_text.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
+        # Zone de résultats (créée à la première ouverture de l'onglet ou au premier test)
+        self._diagnostic_frame = diagnostic_frame
+        self.diagnostic_text = None
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed, add='+')
         
         # Boutons de diagnostic
         button_frame = ttk.Frame(diagnostic_frame)
         button_frame.grid(row=2, column=0, sticky="ew", padx=10, pady=10)
         button_frame.columnconfigure(1, weight=1)
         
-        ttk.Button(button_frame, text="🚀 Lancer Diagnostic Complet", 
-                  command=self.run_full_diagnostic).grid(row=0, column=0, padx=(0, 10))
+        self._diagnostic_button = ttk.Button(button_frame, text="🚀 Lancer Diagnostic Complet", 
+                                             command=self.run_full_diagnostic)
+        self._diagnostic_button.grid(row=0, column=0, padx=(0, 10))
         
         ttk.Button(button_frame, text="🎵 Test Audio Rapide", 
                   command=self.run_audio_test).grid(row=0, column=1, padx=10)
@@ -398,6 +564,20 @@ class SettingsWindow:
         ttk.Button(auto_frame, text="⚙️ Configuration Automatique", 
                   command=self.auto_configure).grid(row=0, column=1, sticky="e")
     
+    def _on_tab_changed(self, event=None):
+        """Crée la zone de diagnostic lorsque son onglet est sélectionné"""
+        if self.diagnostic_text is None and \
+           self.notebook.select() == str(self._diagnostic_frame):
+            self._ensure_diagnostic_text()
+    
+    def _ensure_diagnostic_text(self):
+        """Crée la zone de résultats du diagnostic si nécessaire et la retourne"""
+        if self.diagnostic_text is None:
+            self.diagnostic_text = scrolledtext.ScrolledText(self._diagnostic_frame, height=25,
+                                                             wrap=tk.WORD, undo=False)
+            self.diagnostic_text.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
+        return self.diagnostic_text
+    
     def create_advanced_tab(self):
         """Crée l'onglet des paramètres avancés"""
         advanced_frame = ttk.Frame(self.notebook)
@@ -408,7 +588,7 @@ class SettingsWindow:
         row = 0
         
         # Titre
-        title_label = ttk.Label(advanced_frame, text="Paramètres Avancés", font=("Arial", 12, "bold"))
+        title_label = ttk.Label(advanced_frame, text="Paramètres Avancés", font=self._font_title)
         title_label.grid(row=row, column=0, columnspan=2, pady=(10, 20), sticky="w")
         row += 1
         
@@ -494,37 +674,37 @@ class SettingsWindow:
             # Profil audio
             current_profile = self.config_manager.get("audio_profile", "auto")
             profile_display = self.audio_profiles.get(current_profile, self.audio_profiles["auto"])
-            self.vars['audio_profile'].set(profile_display)
+            self._set_if_changed('audio_profile', profile_display)
             
             # Paramètres audio
-            self.vars['sample_rate'].set(self.config_manager.get("custom_sample_rate", 44100))
-            self.vars['buffer_size'].set(self.config_manager.get("custom_buffer_size", 1024))
-            self.vars['compression_enabled'].set(self.config_manager.get("compression_enabled", True))
-            self.vars['compression_level'].set(self.config_manager.get("compression_level", 1))
+            self._set_if_changed('sample_rate', self.config_manager.get("custom_sample_rate", 44100))
+            self._set_if_changed('buffer_size', self.config_manager.get("custom_buffer_size", 1024))
+            self._set_if_changed('compression_enabled', self.config_manager.get("compression_enabled", True))
+            self._set_if_changed('compression_level', self.config_manager.get("compression_level", 1))
             
             # VOX
-            self.vars['vox_enabled'].set(self.config_manager.get("vox_enabled", False))
-            self.vars['vox_threshold'].set(self.config_manager.get("vox_threshold", -30.0))
-            self.vars['vox_delay'].set(self.config_manager.get("vox_delay", 500))
-            self.vars['vox_hangtime'].set(self.config_manager.get("vox_hangtime", 1000))
+            self._set_if_changed('vox_enabled', self.config_manager.get("vox_enabled", False))
+            self._set_if_changed('vox_threshold', self.config_manager.get("vox_threshold", -30.0))
+            self._set_if_changed('vox_delay', self.config_manager.get("vox_delay", 500))
+            self._set_if_changed('vox_hangtime', self.config_manager.get("vox_hangtime", 1000))
             
             # Réseau
-            self.vars['server_port'].set(self.config_manager.get("server_port", 12345))
-            self.vars['connection_timeout'].set(self.config_manager.get("connection_timeout", 10))
-            self.vars['tcp_nodelay'].set(self.config_manager.get("tcp_nodelay", True))
-            self.vars['network_optimization'].set(self.config_manager.get("network_optimization", True))
+            self._set_if_changed('server_port', self.config_manager.get("server_port", 12345))
+            self._set_if_changed('connection_timeout', self.config_manager.get("connection_timeout", 10))
+            self._set_if_changed('tcp_nodelay', self.config_manager.get("tcp_nodelay", True))
+            self._set_if_changed('network_optimization', self.config_manager.get("network_optimization", True))
             
             # Diagnostic
-            self.vars['auto_diagnostic'].set(self.config_manager.get("auto_diagnostic", True))
+            self._set_if_changed('auto_diagnostic', self.config_manager.get("auto_diagnostic", True))
             
             # Avancé
-            self.vars['thread_priority'].set(self.config_manager.get("thread_priority", "high"))
-            self.vars['cpu_optimization'].set(self.config_manager.get("cpu_optimization", True))
-            self.vars['memory_optimization'].set(self.config_manager.get("memory_optimization", True))
-            self.vars['experimental_features'].set(self.config_manager.get("experimental_features", False))
-            self.vars['log_level'].set(self.config_manager.get("log_level", "INFO"))
-            self.vars['theme'].set(self.config_manager.get("theme", "light"))
-            self.vars['show_performance_metrics'].set(self.config_manager.get("show_performance_metrics", False))
+            self._set_if_changed('thread_priority', self.config_manager.get("thread_priority", "high"))
+            self._set_if_changed('cpu_optimization', self.config_manager.get("cpu_optimization", True))
+            self._set_if_changed('memory_optimization', self.config_manager.get("memory_optimization", True))
+            self._set_if_changed('experimental_features', self.config_manager.get("experimental_features", False))
+            self._set_if_changed('log_level', self.config_manager.get("log_level", "INFO"))
+            self._set_if_changed('theme', self.config_manager.get("theme", "light"))
+            self._set_if_changed('show_performance_metrics', self.config_manager.get("show_performance_metrics", False))
             
             # Met à jour l'état VOX
             self.on_vox_toggle()
@@ -532,32 +712,30 @@ class SettingsWindow:
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors du chargement des paramètres: {e}")
     
+    def _set_if_changed(self, key, value):
+        """Affecte une variable Tk seulement si sa valeur change (évite les traces inutiles)"""
+        var = self.vars[key]
+        try:
+            if var.get() == value:
+                return
+        except tk.TclError:
+            pass  # Valeur actuelle invalide (ex: saisie manuelle), on la remplace
+        var.set(value)
+    
     def on_profile_change(self, event=None):
         """Gestionnaire de changement de profil audio"""
         try:
             selected_display = self.vars['audio_profile'].get()
             
             # Trouve la clé correspondante
-            profile_key = None
-            for key, display in self.audio_profiles.items():
-                if display == selected_display:
-                    profile_key = key
-                    break
+            profile_key = self._profile_display_to_key.get(selected_display)
             
             if profile_key and profile_key != "auto":
                 # Met à jour les paramètres selon le profil
-                profile_settings = {
-                    "ultra_minimal_latency": {"sample_rate": 48000, "buffer_size": 128},
-                    "ultra_low_latency": {"sample_rate": 44100, "buffer_size": 512},
-                    "low_latency": {"sample_rate": 44100, "buffer_size": 1024},
-                    "quality": {"sample_rate": 44100, "buffer_size": 2048},
-                    "bandwidth_saving": {"sample_rate": 22050, "buffer_size": 4096}
-                }
-                
-                if profile_key in profile_settings:
-                    settings = profile_settings[profile_key]
-                    self.vars['sample_rate'].set(settings["sample_rate"])
-                    self.vars['buffer_size'].set(settings["buffer_size"])
+                if profile_key in _PROFILE_SETTINGS:
+                    sample_rate, buffer_size = _PROFILE_SETTINGS[profile_key]
+                    self.vars['sample_rate'].set(sample_rate)
+                    self.vars['buffer_size'].set(buffer_size)
                     
         except Exception as e:
             print(f"Erreur lors du changement de profil: {e}")
@@ -565,26 +743,38 @@ class SettingsWindow:
     def on_vox_toggle(self):
         """Active/désactive les contrôles VOX"""
         enabled = self.vars['vox_enabled'].get()
+        flag = "!disabled" if enabled else "disabled"
         
-        # Liste des types de widgets qui supportent l'option 'state'
-        state_supported_widgets = (ttk.Entry, ttk.Combobox, ttk.Scale, ttk.Checkbutton, 
-                                 ttk.Button, ttk.Radiobutton, ttk.Spinbox)
-        
-        # Active/désactive les widgets dans le frame VOX
+        # Une seule commande Tcl pour tous les widgets (chemins pré-calculés)
+        if self._vox_stateful_paths:
+            try:
+                self.window.tk.eval(";".join(f"{path} state {flag}" for path in self._vox_stateful_paths))
+            except tk.TclError:
+                pass  # Ignore les widgets qui ne supportent pas cette option
+    
+    def _cache_vox_stateful_widgets(self):
+        """Mémorise les chemins Tk des widgets VOX dont l'état doit suivre l'activation"""
+        paths = []
         for widget in self.vox_params_frame.winfo_children():
-            if isinstance(widget, state_supported_widgets):
-                try:
-                    widget.configure(state="normal" if enabled else "disabled")
-                except tk.TclError:
-                    pass  # Ignore les widgets qui ne supportent pas cette option
+            if isinstance(widget, _STATEFUL_WIDGETS):
+                paths.append(str(widget))
             
             # Récursif pour les frames imbriquées
             for child in widget.winfo_children():
-                if isinstance(child, state_supported_widgets):
-                    try:
-                        child.configure(state="normal" if enabled else "disabled")
-                    except tk.TclError:
-                        pass  # Ignore les widgets qui ne supportent pas cette option
+                if isinstance(child, _STATEFUL_WIDGETS):
+                    paths.append(str(child))
+        
+        self._vox_stateful_paths = paths
+    
+    def _pa(self):
+        """Retourne l'instance PyAudio partagée (créée au premier appel)"""
+        if pyaudio is None:
+            raise ImportError("PyAudio n'est pas installé")
+        
+        with self._pa_lock:
+            if self._pa_inst is None:
+                self._pa_inst = pyaudio.PyAudio()
+            return self._pa_inst
     
     def start_vox_test(self):
         """Démarre le test VOX en temps réel"""
@@ -598,10 +788,7 @@ class SettingsWindow:
     def start_audio_monitoring(self):
         """Démarre le monitoring audio pour le VU-mètre"""
         try:
-            import pyaudio
-            import numpy as np
-            
-            self.audio_monitor = pyaudio.PyAudio()
+            pa = self._pa()
             
             # Configuration audio
             format = pyaudio.paInt16
@@ -609,27 +796,26 @@ class SettingsWindow:
             rate = 44100
             chunk = 1024
             
-            # Ouvrir le stream audio
-            self.audio_stream = self.audio_monitor.open(
+            # Dernier niveau mesuré par le callback
+            self._level_latest = None
+            
+            # Compilation JIT éventuelle faite ici plutôt qu'au premier callback audio
+            rms_int16(np.zeros(chunk, dtype=np.int16))
+            
+            # Ouvrir le stream audio en mode callback (pas de lecture bloquante)
+            self.audio_stream = pa.open(
                 format=format,
                 channels=channels,
                 rate=rate,
                 input=True,
-                frames_per_buffer=chunk
+                frames_per_buffer=chunk,
+                stream_callback=self._vox_cb
             )
             
             # Changer le texte du bouton
-            for widget in self.window.winfo_children():
-                if isinstance(widget, ttk.Notebook):
-                    for tab in widget.tabs():
-                        frame = widget.nametowidget(tab)
-                        for child in frame.winfo_children():
-                            if isinstance(child, ttk.LabelFrame) and "Niveau Audio" in str(child['text']):
-                                for button in child.winfo_children():
-                                    if isinstance(button, ttk.Button) and "Test VOX" in str(button['text']):
-                                        button.config(text="🔴 Arrêter le monitoring")
+            self.vox_button.config(text="🔴 Arrêter le monitoring")
             
-            # Démarrer la lecture des données audio
+            # Démarrer la mise à jour périodique de l'affichage
             self.update_audio_level()
             
         except Exception as e:
@@ -638,104 +824,145 @@ class SettingsWindow:
     
     def stop_audio_monitoring(self):
         """Arrête le monitoring audio"""
+        # Rien à arrêter: ni flux ouvert ni mise à jour programmée
+        if self.audio_stream is None and self._level_tick_id is None:
+            return
+        
         try:
-            if hasattr(self, 'audio_stream'):
+            # Annuler la mise à jour programmée de l'affichage
+            if self._level_tick_id is not None:
+                self.window.after_cancel(self._level_tick_id)
+                self._level_tick_id = None
+            
+            if self.audio_stream is not None:
                 self.audio_stream.stop_stream()
                 self.audio_stream.close()
-            if hasattr(self, 'audio_monitor'):
-                self.audio_monitor.terminate()
+                self.audio_stream = None
             
             # Remettre le texte du bouton
-            for widget in self.window.winfo_children():
-                if isinstance(widget, ttk.Notebook):
-                    for tab in widget.tabs():
-                        frame = widget.nametowidget(tab)
-                        for child in frame.winfo_children():
-                            if isinstance(child, ttk.LabelFrame) and "Niveau Audio" in str(child['text']):
-                                for button in child.winfo_children():
-                                    if isinstance(button, ttk.Button) and "Arrêter" in str(button['text']):
-                                        button.config(text="🎤 Test VOX en Temps Réel")
+            self.vox_button.config(text="🎤 Test VOX en Temps Réel")
             
             # Remettre les barres à zéro
-            self.audio_level_var.set(0)
+            self._draw_level(0)
             self.level_label.config(text="Niveau: 0.000")
+            self._last_db_i = None
+            self._last_level = None
             
         except Exception as e:
             print(f"Erreur lors de l'arrêt du monitoring: {e}")
     
-    def update_audio_level(self):
-        """Met à jour le niveau audio en temps réel"""
-        if not self.vox_test_running:
-            return
-            
+    def _vox_cb(self, in_data, frame_count, time_info, status):
+        """Callback PyAudio (thread audio): calcule le niveau RMS en dB du chunk"""
         try:
-            import numpy as np
+            audio_data = np.frombuffer(in_data, dtype=np.int16)
             
-            # Lire les données audio
-            data = self.audio_stream.read(1024, exception_on_overflow=False)
-            audio_data = np.frombuffer(data, dtype=np.int16)
+            # Crête calculée directement sur les int16 (max/min évitent le
+            # débordement de abs(-32768)); le RMS ne dépasse jamais la crête
+            peak = max(int(audio_data.max()), -int(audio_data.min())) if len(audio_data) else 0
             
-            # Calculer le niveau RMS en dB
-            rms = np.sqrt(np.mean(audio_data.astype(np.float32) ** 2))
-            if rms > 0:
-                import math
-                level = 20 * math.log10(rms / 32767.0)  # Convertir en dB
-                level = max(-60.0, level)  # Limiter à -60dB minimum
+            if peak * _INV_32768 < _VU_FLOOR:
+                level = -60.0  # Sous le plancher: inutile de calculer le RMS
             else:
-                level = -60.0
+                rms = rms_int16(audio_data)
+                
+                if rms <= _RMS_FLOOR:
+                    level = -60.0  # Limiter à -60dB minimum sans calculer le log
+                else:
+                    level = 20 * math.log10(rms * _INV_REF)  # Convertir en dB
             
-            # Mettre à jour l'interface (convertir dB vers 0-1 pour l'affichage de la barre)
-            display_level = max(0, min(1, (level + 60) / 60))  # -60dB à 0dB -> 0 à 1
-            self.audio_level_var.set(display_level)
-            self.level_label.config(text=f"Niveau: {level:.1f} dB")
+            # Seul le dernier niveau est conservé (affectation atomique), lu depuis le thread Tk
+            self._level_latest = level
+        except Exception as e:
+            print(f"Erreur callback monitoring audio: {e}")
+        
+        return (None, pyaudio.paContinue)
+    
+    def update_audio_level(self):
+        """Met à jour le niveau audio en temps réel"""
+        if not self.vox_test_running:
+            return
             
-            # Vérifier le seuil VOX
-            threshold = self.vars['vox_threshold'].get()
-            if level > threshold:
-                self.level_label.config(foreground="green")
-            else:
-                self.level_label.config(foreground="red")
+        try:
+            # Récupérer le dernier niveau calculé par le callback audio
+            level = self._level_latest
+            delay = 150  # Niveau stable ou absent: rafraîchissement ralenti
+            if level is not None:
+                self._level_latest = None
+                
+                # Rafraîchissement rapide seulement si le niveau bouge (> 1.5 dB)
+                if self._last_level is None or abs(level - self._last_level) > 1.5:
+                    delay = 50
+                self._last_level = level
+                
+                # Mettre à jour l'interface seulement si la valeur affichée (0.1 dB) change
+                db_i = int(level * 10)
+                if db_i != self._last_db_i:
+                    display_level = max(0, min(1, (level + 60) / 60))  # -60dB à 0dB -> 0 à 1
+                    self._draw_level(display_level)
+                    self.level_label.config(text=f"Niveau: {level:.1f} dB")
+                    self._last_db_i = db_i
+                
+                # Vérifier le seuil VOX
+                threshold = self.vars['vox_threshold'].get()
+                color = "green" if level > threshold else "red"
+                if color != self._last_color:
+                    self.level_label.config(foreground=color)
+                    self._last_color = color
             
             # Programmer la prochaine mise à jour
-            self.window.after(50, self.update_audio_level)  # 20 FPS
+            self._level_tick_id = self.window.after(delay, self.update_audio_level)  # 20 FPS max
             
         except Exception as e:
             print(f"Erreur monitoring audio: {e}")
             self.vox_test_running = False
     
+    def _draw_level(self, display_level):
+        """Redimensionne la barre du VU-mètre (display_level entre 0 et 1)"""
+        width = self.audio_level_bar.winfo_width()
+        self.audio_level_bar.coords(self._level_rect, 0, 0, int(display_level * width), 16)
+    
     def test_network(self):
         """Teste la connectivité réseau"""
         self.network_status_label.config(text="Test en cours...", foreground="orange")
         self.window.update()
         
+        # Lu dans le thread Tk avant de lancer le test
+        try:
+            port = self.vars['server_port'].get()
+        except (tk.TclError, ValueError) as e:
+            self.network_status_label.config(text=f"❌ Erreur: {e}", foreground="red")
+            return
+        
         def run_test():
             try:
-                import socket
-                import time
-                
-                # Test de port
-                port = self.vars['server_port'].get()
+                # Test de port (bind local uniquement, aucun timeout nécessaire)
                 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(5)
-                
                 try:
-                    sock.bind(('localhost', port))
-                    sock.close()
+                    # Comme le serveur; pas sous Windows où SO_REUSEADDR
+                    # autoriserait le bind même si le port est déjà pris
+                    if sys.platform != 'win32':
+                        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                    sock.bind(('127.0.0.1', port))
                     port_status = f"✅ Port {port} disponible"
-                except:
+                except OSError:
                     port_status = f"❌ Port {port} occupé"
+                finally:
+                    sock.close()
                 
-                # Test de latence
-                start_time = time.time()
-                test_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                test_sock.settimeout(5)
+                # Test de latence: aller simple d'un octet sur une paire de sockets locale
                 try:
-                    test_sock.connect(('127.0.0.1', 80))
-                    latency = (time.time() - start_time) * 1000
-                    latency_status = f"🌐 Latence locale: {latency:.1f}ms"
-                except:
+                    sock_a, sock_b = socket.socketpair()
+                    try:
+                        start_time = time.perf_counter_ns()
+                        sock_a.send(b'x')
+                        sock_b.recv(1)
+                        latency = (time.perf_counter_ns() - start_time) / 1e6
+                    finally:
+                        sock_a.close()
+                        sock_b.close()
+                    latency_status = f"🌐 Latence locale: {latency:.3f}ms"
+                except OSError:
                     latency_status = "⚠️ Test de latence échoué"
-                test_sock.close()
                 
                 result = f"{port_status}\n{latency_status}"
                 
@@ -749,36 +976,58 @@ class SettingsWindow:
                     self.network_status_label.config(text=f"❌ Erreur: {e}", foreground="red")
                 self.window.after(0, update_error)
         
-        threading.Thread(target=run_test, daemon=True).start()
+        _submit_background(run_test)
     
     def run_full_diagnostic(self):
         """Lance le diagnostic complet"""
+        # Un seul diagnostic à la fois: le bouton reste désactivé jusqu'à la fin du précédent
+        if self._diagnostic_running:
+            return
+        self._diagnostic_running = True
+        self._diagnostic_button.config(state='disabled')
+        
+        self._ensure_diagnostic_text()
         self.diagnostic_text.delete(1.0, tk.END)
         self.diagnostic_text.insert(tk.END, "🔍 Lancement du diagnostic complet...\n\n")
-        self.diagnostic_text.update()
+        
+        # Le VU-mètre utilise déjà PyAudio dans ce processus: ne pas y ouvrir
+        # d'autres flux, le diagnostic passe alors par un interpréteur séparé
+        monitoring_active = self.audio_stream is not None
         
         def run_diagnostic():
             try:
                 # Exécute le script de diagnostic
-                diagnostic_path = Path(__file__).parent.parent / "diagnostic.py"
-                if not diagnostic_path.exists():
-                    diagnostic_path = Path.cwd() / "diagnostic.py"
+                diagnostic_path = self._diagnostic_path
                 
-                if diagnostic_path.exists():
-                    result = subprocess.run([sys.executable, str(diagnostic_path)], 
-                                          capture_output=True, text=True, 
-                                          cwd=str(diagnostic_path.parent))
+                if diagnostic_path is not None:
+                    # Seul le début du rapport est conservé pour la configuration
+                    stored_parts = []
+                    stored_len = 0
+                    
+                    def emit(text):
+                        nonlocal stored_len
+                        if stored_len < 1000:
+                            stored_parts.append(text)
+                            stored_len += len(text)
+                        self.window.after(0, self._append_diagnostic, text)
+                    
+                    if monitoring_active:
+                        returncode = self._run_diagnostic_subprocess(diagnostic_path, emit)
+                    else:
+                        try:
+                            returncode = self._run_diagnostic_in_process(diagnostic_path, emit)
+                        except ImportError:
+                            # Dépendance du diagnostic absente de ce processus: script séparé
+                            returncode = self._run_diagnostic_subprocess(diagnostic_path, emit)
+                    output = "".join(stored_parts)
                     
                     def update_results():
-                        self.diagnostic_text.delete(1.0, tk.END)
-                        if result.returncode == 0:
-                            self.diagnostic_text.insert(tk.END, result.stdout)
-                        else:
-                            self.diagnostic_text.insert(tk.END, f"❌ Erreur lors du diagnostic:\n{result.stderr}")
+                        if returncode != 0:
+                            self._append_diagnostic(f"\n❌ Erreur lors du diagnostic (code {returncode})\n")
                         
                         # Sauvegarde les résultats
                         self.config_manager.set("last_diagnostic_date", datetime.now().isoformat())
-                        self.config_manager.set("diagnostic_results", result.stdout[:1000])  # Limite la taille
+                        self.config_manager.set("diagnostic_results", output[:1000])  # Limite la taille
                     
                     self.window.after(0, update_results)
                 else:
@@ -792,60 +1041,99 @@ class SettingsWindow:
                     self.diagnostic_text.delete(1.0, tk.END)
                     self.diagnostic_text.insert(tk.END, f"❌ Erreur: {e}")
                 self.window.after(0, show_exception)
+            finally:
+                self.window.after(0, self._diagnostic_finished)
         
-        threading.Thread(target=run_diagnostic, daemon=True).start()
+        _submit_background(run_diagnostic)
+    
+    def _diagnostic_finished(self):
+        """Réactive le lancement du diagnostic (à appeler depuis le thread Tk)"""
+        self._diagnostic_running = False
+        self._diagnostic_button.config(state='normal')
+    
+    def _run_diagnostic_in_process(self, diagnostic_path, emit):
+        """Exécute diagnostic.main() dans ce processus en lui passant un flux vers emit"""
+        # Chargé depuis son chemin sous un nom dédié: sys.path n'est pas modifié et
+        # aucun autre module nommé "diagnostic" ne peut être importé à sa place
+        spec = importlib.util.spec_from_file_location("lanvoice_diagnostic", diagnostic_path)
+        diagnostic = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(diagnostic)
+        
+        # Sortie transmise au fil de l'eau, comme avec le script séparé; le flux est
+        # passé explicitement car sys.stdout est partagé avec les autres threads
+        stream = _DiagnosticStream(emit)
+        returncode = diagnostic.main(out=stream) if hasattr(diagnostic, "main") else 0
+        return returncode or 0
+    
+    def _run_diagnostic_subprocess(self, diagnostic_path, emit):
+        """Exécute diagnostic.py dans un interpréteur séparé en lisant sa sortie ligne par ligne"""
+        process = subprocess.Popen([sys.executable, str(diagnostic_path)],
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, bufsize=1,
+                                   cwd=str(diagnostic_path.parent))
+        for line in process.stdout:
+            emit(line)
+        process.stdout.close()
+        return process.wait()
+    
+    def _append_diagnostic(self, text):
+        """Ajoute du texte à la zone de diagnostic (à appeler depuis le thread Tk)"""
+        self.diagnostic_text.insert(tk.END, text)
+        self.diagnostic_text.see(tk.END)
     
     def run_audio_test(self):
         """Lance un test audio rapide"""
+        self._ensure_diagnostic_text()
         self.diagnostic_text.delete(1.0, tk.END)
         self.diagnostic_text.insert(tk.END, "🎵 Test audio rapide...\n\n")
         
         def test_audio():
             try:
-                import pyaudio
-                
-                result_text = "📊 RÉSULTATS DU TEST AUDIO RAPIDE\n"
-                result_text += "=" * 50 + "\n\n"
+                parts = ["📊 RÉSULTATS DU TEST AUDIO RAPIDE\n", "=" * 50, "\n\n"]
                 
-                p = pyaudio.PyAudio()
-                device_count = p.get_device_count()
+                p = self._pa()
                 
-                result_text += f"🎵 Périphériques audio détectés: {device_count}\n"
+                # Seulement l'API hôte par défaut: sous Windows chaque périphérique physique
+                # est sinon listé une fois par API (MME, DirectSound, WASAPI...)
+                host_api = p.get_default_host_api_info()
+                host_index = host_api['index']
+                devices = [p.get_device_info_by_host_api_device_index(host_index, i)
+                           for i in range(host_api['deviceCount'])]
                 
-                input_devices = []
-                output_devices = []
+                parts.append(f"🎵 Périphériques audio détectés: {len(devices)} ({host_api['name']})\n")
                 
-                for i in range(device_count):
-                    info = p.get_device_info_by_index(i)
-                    if info['maxInputChannels'] > 0:
-                        input_devices.append(info['name'])
-                    if info['maxOutputChannels'] > 0:
-                        output_devices.append(info['name'])
+                input_devices = [d['name'] for d in devices if d['maxInputChannels'] > 0]
+                output_devices = [d['name'] for d in devices if d['maxOutputChannels'] > 0]
                 
-                result_text += f"🎤 Microphones: {len(input_devices)}\n"
-                result_text += f"🔊 Haut-parleurs: {len(output_devices)}\n\n"
+                parts.append(f"🎤 Microphones: {len(input_devices)}\n")
+                parts.append(f"🔊 Haut-parleurs: {len(output_devices)}\n\n")
                 
-                # Test des profils
-                profiles = [
-                    ("Ultra Low", 44100, 512),
-                    ("Low Latency", 44100, 1024),
-                    ("Quality", 44100, 2048)
-                ]
+                # Périphériques par défaut résolus une seule fois pour tous les profils
+                try:
+                    default_in = p.get_default_input_device_info()['index']
+                    default_out = p.get_default_output_device_info()['index']
+                    device_error = None
+                except Exception as e:
+                    default_in = default_out = None
+                    device_error = e
                 
-                result_text += "⚡ Test des profils de latence:\n"
-                for name, rate, buffer in profiles:
+                parts.append("⚡ Test des profils de latence:\n")
+                for name, rate, buffer, latency in _AUDIO_TEST_PROFILES:
                     try:
-                        stream = p.open(format=pyaudio.paInt16, channels=1, rate=rate,
-                                      input=True, output=True, frames_per_buffer=buffer)
-                        latency = (buffer / rate) * 1000
-                        stream.close()
-                        result_text += f"  ✅ {name}: ~{latency:.1f}ms\n"
+                        if device_error is not None:
+                            raise device_error
+                        # Validation des paramètres sans ouvrir de stream matériel
+                        p.is_format_supported(rate,
+                                              input_device=default_in, input_channels=1,
+                                              input_format=pyaudio.paInt16,
+                                              output_device=default_out, output_channels=1,
+                                              output_format=pyaudio.paInt16)
+                        parts.append(f"  ✅ {name}: ~{latency:.1f}ms\n")
                     except Exception as e:
-                        result_text += f"  ❌ {name}: Erreur - {str(e)[:50]}...\n"
+                        parts.append(f"  ❌ {name}: Erreur - {str(e)[:50]}...\n")
                 
-                p.terminate()
-                
-                result_text += f"\n🕒 Test terminé: {datetime.now().strftime('%H:%M:%S')}\n"
+                parts.append(f"\n🕒 Test terminé: {datetime.now().strftime('%H:%M:%S')}\n")
+                result_text = "".join(parts)
                 
                 def update_text():
                     self.diagnostic_text.delete(1.0, tk.END)
@@ -859,13 +1147,12 @@ class SettingsWindow:
                     self.diagnostic_text.insert(tk.END, f"❌ Erreur lors du test audio: {e}")
                 self.window.after(0, show_error)
         
-        threading.Thread(target=test_audio, daemon=True).start()
+        _submit_background(test_audio)
     
     def save_diagnostic_report(self):
         """Sauvegarde le rapport de diagnostic"""
+        self._ensure_diagnostic_text()
         try:
-            from tkinter import filedialog
-            
             filename = filedialog.asksaveasfilename(
                 defaultextension=".txt",
                 filetypes=[("Fichiers texte", "*.txt"), ("Tous les fichiers", "*.*")],
@@ -873,31 +1160,59 @@ class SettingsWindow:
             )
             
             if filename:
-                content = self.diagnostic_text.get(1.0, tk.END)
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                self._write_diagnostic_report(filename)
                 messagebox.showinfo("Succès", f"Rapport sauvegardé: {filename}")
                 
         except Exception as e:
             messagebox.showerror("Erreur", f"Erreur lors de la sauvegarde: {e}")
     
+    def _write_diagnostic_report(self, filename, lines_per_chunk=500):
+        """Écrit le contenu de la zone de diagnostic par blocs dans un fichier temporaire,
+        puis le renomme atomiquement (pas de fichier à moitié écrit en cas d'erreur)"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)),
+                                        prefix=".diag", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', buffering=65536) as f:
+                end_line = int(self.diagnostic_text.index('end-1c').split('.')[0])
+                for i in range(1, end_line + 1, lines_per_chunk):
+                    f.write(self.diagnostic_text.get(f"{i}.0", f"{i + lines_per_chunk}.0"))
+            
+            # mkstemp crée le fichier en 0600: reprendre les droits du rapport remplacé,
+            # sinon ceux d'un fichier ordinaire (0666 moins l'umask)
+            try:
+                mode = os.stat(filename).st_mode & 0o7777
+            except FileNotFoundError:
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+            os.chmod(tmp_path, mode)
+            
+            os.replace(tmp_path, filename)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    
     def auto_configure(self):
         """Configuration automatique basée sur le diagnostic"""
         if messagebox.askyesno("Configuration Automatique", 
                              "Voulez-vous lancer un diagnostic et appliquer automatiquement "
                              "la configuration optimale pour votre système?"):
             
+            self._ensure_diagnostic_text()
             self.diagnostic_text.delete(1.0, tk.END)
             self.diagnostic_text.insert(tk.END, "🤖 Configuration automatique en cours...\n\n")
             
             def auto_config():
                 try:
                     # Simulation d'analyse du système
-                    import psutil
-                    import time
-                    
-                    # Analyse CPU et RAM
-                    cpu_percent = psutil.cpu_percent(interval=1)
+                    # Analyse CPU et RAM (le premier appel initialise les compteurs,
+                    # le second retourne l'utilisation sur les 100ms écoulées)
+                    psutil.cpu_percent(interval=None)
+                    time.sleep(0.1)
+                    cpu_percent = psutil.cpu_percent(interval=None)
                     ram_percent = psutil.virtual_memory().percent
                     
                     config_text = f"📊 Analyse système:\n"
@@ -959,13 +1274,11 @@ class SettingsWindow:
                         self.diagnostic_text.insert(tk.END, f"❌ Erreur configuration automatique: {e}")
                     self.window.after(0, show_error)
             
-            threading.Thread(target=auto_config, daemon=True).start()
+            _submit_background(auto_config)
     
     def export_config(self):
         """Exporte la configuration"""
         try:
-            from tkinter import filedialog
-            
             filename = filedialog.asksaveasfilename(
                 defaultextension=".json",
                 filetypes=[("Fichiers JSON", "*.json"), ("Tous les fichiers", "*.*")],
@@ -985,8 +1298,6 @@ class SettingsWindow:
     def import_config(self):
         """Importe une configuration"""
         try:
-            from tkinter import filedialog
-            
             filename = filedialog.askopenfilename(
                 filetypes=[("Fichiers JSON", "*.json"), ("Tous les fichiers", "*.*")],
                 title="Importer une configuration"
@@ -1027,45 +1338,20 @@ class SettingsWindow:
         try:
             # Convertit le profil affiché en clé
             profile_display = self.vars['audio_profile'].get()
-            profile_key = "auto"
-            for key, display in self.audio_profiles.items():
-                if display == profile_display:
-                    profile_key = key
-                    break
+            profile_key = self._profile_display_to_key.get(profile_display, "auto")
             
-            # Prépare les mises à jour
-            updates = {
-                # Audio
-                "audio_profile": profile_key,
-                "custom_sample_rate": self.vars['sample_rate'].get(),
-                "custom_buffer_size": self.vars['buffer_size'].get(),
-                "compression_enabled": self.vars['compression_enabled'].get(),
-                "compression_level": self.vars['compression_level'].get(),
-                
-                # VOX
-                "vox_enabled": self.vars['vox_enabled'].get(),
-                "vox_threshold": self.vars['vox_threshold'].get(),
-                "vox_delay": self.vars['vox_delay'].get(),
-                "vox_hangtime": self.vars['vox_hangtime'].get(),
-                
-                # Réseau
-                "server_port": self.vars['server_port'].get(),
-                "connection_timeout": self.vars['connection_timeout'].get(),
-                "tcp_nodelay": self.vars['tcp_nodelay'].get(),
-                "network_optimization": self.vars['network_optimization'].get(),
-                
-                # Diagnostic
-                "auto_diagnostic": self.vars['auto_diagnostic'].get(),
-                
-                # Avancé
-                "thread_priority": self.vars['thread_priority'].get(),
-                "cpu_optimization": self.vars['cpu_optimization'].get(),
-                "memory_optimization": self.vars['memory_optimization'].get(),
-                "experimental_features": self.vars['experimental_features'].get(),
-                "log_level": self.vars['log_level'].get(),
-                "theme": self.vars['theme'].get(),
-                "show_performance_metrics": self.vars['show_performance_metrics'].get()
-            }
+            # Prépare les mises à jour (seulement les valeurs modifiées)
+            updates = {}
+            if self.config_manager.get("audio_profile") != profile_key:
+                updates["audio_profile"] = profile_key
+            
+            for config_key, var_key in self._CONFIG_VARS:
+                value = self.vars[var_key].get()
+                if self.config_manager.get(config_key) != value:
+                    updates[config_key] = value
+            
+            if not updates:
+                return True  # Rien à écrire
             
             # Applique les mises à jour
             success = self.config_manager.update_multiple(updates)
@@ -1080,12 +1366,25 @@ class SettingsWindow:
             messagebox.showerror("Erreur", f"Erreur lors de l'application: {e}")
             return False
     
+    def _on_destroy(self, event):
+        """Arrête le pool de fond quand la fenêtre elle-même est détruite"""
+        if event.widget is self.window:
+            _shutdown_background_pool()
+    
     def cancel(self):
         """Annule et ferme la fenêtre"""
-        # Arrêter le monitoring audio s'il est actif
-        if hasattr(self, 'vox_test_running') and self.vox_test_running:
-            self.vox_test_running = False
-            self.stop_audio_monitoring()
+        # Arrêter le monitoring audio s'il est actif (retour immédiat sinon)
+        self.vox_test_running = False
+        self.stop_audio_monitoring()
+        
+        # Libérer PyAudio à la fermeture de la fenêtre
+        with self._pa_lock:
+            if self._pa_inst is not None:
+                try:
+                    self._pa_inst.terminate()
+                except Exception as e:
+                    print(f"Erreur lors de la libération de PyAudio: {e}")
+                self._pa_inst = None
         
         if self.window:
             self.window.destroy()
@@ -6,11 +6,11 @@ Mesure les améliorations de latence et qualité
 import time
 import threading
 import sys
-import os
 import statistics
-
-# Ajouter le dossier src au path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+import multiprocessing
+import hashlib
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from src.audio_config import AudioConfig, AudioOptimizer, benchmark_audio_configs
@@ -45,90 +45,258 @@ def test_audio_configurations():
             ("BANDWIDTH_SAVING", AudioConfig.BANDWIDTH_SAVING)
         ]
         
+        # Un seul stream par combinaison (format, canaux, fréquence, chunk): PortAudio fixe
+        # la taille du buffer à l'ouverture, les profils identiques partagent donc le même stream
+        groups = {}
         for name, config in configs_to_test:
-            print(f"\n📊 Test: {name}")
-            try:
-                # Tester la création d'un stream d'entrée
-                stream = audio.open(
-                    format=config['FORMAT'],
-                    channels=config['CHANNELS'],
-                    rate=config['RATE'],
-                    input=True,
-                    frames_per_buffer=config['CHUNK']
-                )
-                
-                # Mesurer le temps de lecture d'un chunk
-                start_time = time.perf_counter()
-                data = stream.read(config['CHUNK'], exception_on_overflow=False)
-                read_time = time.perf_counter() - start_time
-                
-                stream.stop_stream()
-                stream.close()
-                
-                theoretical_latency = AudioConfig.get_latency_ms(config)
-                actual_latency = read_time * 1000
-                
-                print(f"   ✅ Succès - Latence théorique: {theoretical_latency:.1f}ms")
-                print(f"               Latence mesurée: {actual_latency:.1f}ms")
-                print(f"               Taille chunk: {len(data)} bytes")
-                
-            except Exception as e:
-                print(f"   ❌ Échec: {e}")
+            key = (config['FORMAT'], config['CHANNELS'], config['RATE'], config['CHUNK'])
+            groups.setdefault(key, []).append((name, config))
         
+        # Mesures lancées en parallèle (un thread par stream, PortAudio libère le GIL)
+        with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+            results = list(executor.map(lambda item: measure_stream_group(audio, *item), groups.items()))
+        
+        # Certains backends refusent plusieurs streams simultanés: refaire ces mesures en série
+        if any(error is not None for error, _ in results) and len(groups) > 1:
+            print("⚠️ Échec de streams simultanés, nouvelle mesure en série")
+            results = [result if result[0] is None else measure_stream_group(audio, *item)
+                       for result, item in zip(results, groups.items())]
+        
+        report = []  # Affiché après toutes les mesures
+        for _, lines in results:
+            report.extend(lines)
+        
+        sys.stdout.write("\n".join(report) + "\n")
         audio.terminate()
         
     except ImportError:
         print("⚠️ PyAudio non disponible pour les tests pratiques")
 
+# Ouverture/fermeture des streams sérialisées (PortAudio n'est pas garanti thread-safe ici)
+_stream_setup_lock = threading.Lock()
+
+def measure_stream_group(audio, key, group):
+    """Mesure un stream d'entrée en mode callback pour des profils partageant les mêmes paramètres
+    
+    Returns:
+        (erreur ou None, lignes de rapport pour chaque profil du groupe)
+    """
+    import pyaudio
+    
+    audio_format, channels, rate, chunk = key
+    arrivals = []  # Instants d'arrivée des buffers (thread audio)
+    chunk_bytes = [0]
+    
+    def callback(in_data, frame_count, time_info, status):
+        arrivals.append(time.perf_counter())
+        chunk_bytes[0] = len(in_data)
+        return (None, pyaudio.paContinue)
+    
+    try:
+        # Stream d'entrée en mode callback (pas de lecture bloquante)
+        with _stream_setup_lock:
+            stream = audio.open(
+                format=audio_format,
+                channels=channels,
+                rate=rate,
+                input=True,
+                frames_per_buffer=chunk,
+                stream_callback=callback
+            )
+        
+        # Laisser arriver quelques buffers (au moins 50ms), en parallèle des autres streams
+        time.sleep(max(0.05, 5 * chunk / rate))
+        
+        with _stream_setup_lock:
+            stream.stop_stream()
+            stream.close()
+        
+        # Latence mesurée: intervalle moyen entre deux buffers
+        intervals = [b - a for a, b in zip(arrivals, arrivals[1:])]
+        error = None if intervals else "pas assez de buffers reçus"
+    except Exception as e:
+        error = e
+    
+    lines = []
+    for name, config in group:
+        lines.append(f"\n📊 Test: {name}")
+        if error is not None:
+            lines.append(f"   ❌ Échec: {error}")
+            continue
+        
+        theoretical_latency = AudioConfig.get_latency_ms(config)
+        actual_latency = statistics.mean(intervals) * 1000
+        
+        lines.append(f"   ✅ Succès - Latence théorique: {theoretical_latency:.1f}ms")
+        lines.append(f"               Latence mesurée: {actual_latency:.1f}ms ({len(arrivals)} buffers)")
+        lines.append(f"               Taille chunk: {chunk_bytes[0]} bytes")
+    
+    return error, lines
+
+# Ratio (taille compressée / originale) au-delà duquel la compression ne vaut pas son coût CPU
+_MAX_USEFUL_RATIO = 0.9
+
+def compression_codecs():
+    """Codecs comparés par benchmark_compression
+    
+    Returns:
+        (liste de (nom, compression, décompression), noms des modules optionnels absents)
+    """
+    import zlib
+    
+    # Codecs optionnels comparés à zlib
+    try:
+        import lz4.block as lz4_block
+    except ImportError:
+        lz4_block = None
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+    try:
+        from isal import isal_zlib
+    except ImportError:
+        isal_zlib = None
+    
+    compression_levels = [1, 3, 6, 9]  # Niveaux de compression zlib
+    codecs = [(f"zlib {level}", partial(zlib.compress, level=level), zlib.decompress)
+              for level in compression_levels]
+    missing = []
+    if isal_zlib is not None:
+        # Même format que zlib (utilisé par le client et le serveur quand il est installé)
+        codecs.append(("isal 1", partial(isal_zlib.compress, level=1), isal_zlib.decompress))
+    else:
+        missing.append("isal")
+    if lz4_block is not None:
+        # Format bloc: pas d'en-tête de trame, adapté à un paquet par chunk
+        codecs.append(("LZ4 block", partial(lz4_block.compress, mode='fast', acceleration=1),
+                       lz4_block.decompress))
+    else:
+        missing.append("lz4")
+    if zstandard is not None:
+        zstd_decompressor = zstandard.ZstdDecompressor()
+        for level in (1, 3):
+            codecs.append((f"zstd {level}", zstandard.ZstdCompressor(level=level).compress,
+                           zstd_decompressor.decompress))
+    else:
+        missing.append("zstandard")
+    
+    return codecs, missing
+
+# Codecs du processus courant, créés au premier appel de _benchmark_codec (processus du pool)
+_worker_codecs = None
+
+def _benchmark_codec(args):
+    """Mesure un couple (codec, taille de chunk); exécuté dans un processus du pool"""
+    global _worker_codecs
+    name, chunk_size, audio_data, reference_digest, iterations = args
+    
+    if _worker_codecs is None:
+        _worker_codecs = {codec[0]: codec[1:] for codec in compression_codecs()[0]}
+    compress, decompress = _worker_codecs[name]
+    
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        compressed = compress(audio_data)
+    compress_time = (time.perf_counter() - start_time) / iterations
+    
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        decompressed = decompress(compressed)
+    decompress_time = (time.perf_counter() - start_time) / iterations
+    
+    # Intégrité vérifiée hors des mesures, contre l'empreinte calculée une fois par taille
+    intact = hashlib.blake2b(decompressed, digest_size=8).digest() == reference_digest
+    
+    return (chunk_size, name, len(compressed) / len(audio_data),
+            compress_time, decompress_time, intact)
+
 def benchmark_compression():
     """Benchmark de la compression audio"""
     print(f"\n🗜️ BENCHMARK COMPRESSION AUDIO")
     print("=" * 50)
     
-    import zlib
-    import random
+    import numpy as np
     
     # Simuler des données audio de différentes tailles
     test_sizes = [128, 256, 512, 1024, 2048]  # Chunks audio typiques
-    compression_levels = [1, 3, 6, 9]  # Niveaux de compression zlib
+    iterations = 100  # Répétitions par mesure (une seule opération est sous la résolution du timer)
+    
+    codecs, missing = compression_codecs()
+    for module in missing:
+        print(f"⚠️ {module} non installé: codec ignoré")
     
+    # Données audio générées une seule fois dans le processus principal
+    payloads = {}
     for chunk_size in test_sizes:
-        print(f"\n📦 Chunk size: {chunk_size} samples ({chunk_size * 2} bytes)")
-        
-        # Générer des données audio simulées (variation sinusoïdale + bruit)
-        audio_data = bytearray()
-        for i in range(chunk_size):
-            # Simuler audio vocal avec harmoniques
-            sample = int(32767 * 0.3 * (
-                0.7 * (i / chunk_size) +  # Tendance
-                0.2 * ((i * 3) % 100 / 100) +  # Harmonique
-                0.1 * random.random()  # Bruit
-            ))
-            audio_data.extend(sample.to_bytes(2, 'little', signed=True))
-        
-        original_size = len(audio_data)
-        
-        for level in compression_levels:
-            start_time = time.perf_counter()
-            compressed = zlib.compress(audio_data, level=level)
-            compress_time = time.perf_counter() - start_time
-            
-            start_time = time.perf_counter()
-            decompressed = zlib.decompress(compressed)
-            decompress_time = time.perf_counter() - start_time
-            
-            compression_ratio = len(compressed) / original_size
-            total_time = compress_time + decompress_time
-            
-            print(f"   Niveau {level}: {compression_ratio:.3f} ratio, "
-                  f"{total_time*1000:.2f}ms total, "
-                  f"({compress_time*1000:.2f}ms + {decompress_time*1000:.2f}ms)")
-            
-            # Vérifier l'intégrité
-            if decompressed != audio_data:
-                print(f"   ❌ ERREUR: Corruption des données!")
+        # Générer des données audio simulées (variation sinusoïdale + bruit), en une passe NumPy
+        i = np.arange(chunk_size, dtype=np.float32)
+        samples = (32767 * 0.3 * (
+            0.7 * (i / chunk_size) +  # Tendance
+            0.2 * ((i * 3) % 100 / 100) +  # Harmonique
+            0.1 * np.random.random(chunk_size)  # Bruit
+        )).astype(np.int16)
+        payloads[chunk_size] = samples.tobytes()
+    
+    # Empreinte de référence de chaque payload, calculée une seule fois
+    digests = {chunk_size: hashlib.blake2b(payload, digest_size=8).digest()
+               for chunk_size, payload in payloads.items()}
+    
+    # Les couples (taille, codec) sont indépendants: répartis sur tous les cœurs
+    work = [(name, chunk_size, payloads[chunk_size], digests[chunk_size], iterations)
+            for chunk_size in test_sizes for name, _, _ in codecs]
+    with multiprocessing.Pool() as pool:
+        results = pool.map(_benchmark_codec, work)
+    
+    # Temps total et octets (originaux, compressés) cumulés par codec sur toutes les tailles
+    codec_totals = {name: 0.0 for name, _, _ in codecs}
+    codec_bytes = {name: [0, 0.0] for name, _, _ in codecs}
+    
+    # Résultats dans l'ordre du travail soumis: regroupés par taille de chunk
+    lines = []
+    current_size = None
+    for chunk_size, name, compression_ratio, compress_time, decompress_time, intact in results:
+        if chunk_size != current_size:
+            current_size = chunk_size
+            lines.append(f"\n📦 Chunk size: {chunk_size} samples ({chunk_size * 2} bytes)")
+        
+        total_time = compress_time + decompress_time
+        codec_totals[name] += total_time
+        codec_bytes[name][0] += chunk_size * 2
+        codec_bytes[name][1] += compression_ratio * chunk_size * 2
+        
+        lines.append(f"   {name:<10}: {compression_ratio:.3f} ratio, "
+                     f"{total_time*1000:.3f}ms total, "
+                     f"({compress_time*1000:.3f}ms + {decompress_time*1000:.3f}ms)")
+        
+        # Vérifier l'intégrité
+        if not intact:
+            lines.append(f"   ❌ ERREUR: Corruption des données!")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
+    
+    # Ratio global (taille compressée / originale) pondéré par la taille des chunks
+    codec_ratios = {name: compressed / original for name, (original, compressed) in codec_bytes.items()}
     
-    print(f"\n🎯 RECOMMANDATION: Niveau 1 pour temps réel (< 1ms)")
+    # Front de Pareto vitesse/ratio: codecs qu'aucun autre ne bat à la fois en temps et en ratio
+    pareto = [name for name in codec_totals
+              if not any(codec_totals[other] <= codec_totals[name] and
+                         codec_ratios[other] <= codec_ratios[name] and
+                         (codec_totals[other], codec_ratios[other]) != (codec_totals[name], codec_ratios[name])
+                         for other in codec_totals)]
+    pareto.sort(key=codec_totals.get)
+    print("\n📈 Compromis vitesse/ratio (front de Pareto):")
+    for name in pareto:
+        print(f"   {name:<10}: {codec_ratios[name]:.3f} ratio, {codec_totals[name]*1000:.3f}ms cumulés")
+    
+    # Le plus rapide parmi les codecs qui réduisent réellement le volume transmis
+    useful = [name for name in pareto if codec_ratios[name] <= _MAX_USEFUL_RATIO]
+    if useful:
+        recommended = min(useful, key=codec_totals.get)
+        print(f"\n🎯 RECOMMANDATION: {recommended} pour temps réel (le plus rapide avec un ratio "
+              f"≤ {_MAX_USEFUL_RATIO:.2f}: {codec_ratios[recommended]:.3f})")
+    else:
+        print(f"\n🎯 RECOMMANDATION: pas de compression (aucun codec n'atteint un ratio ≤ {_MAX_USEFUL_RATIO:.2f})")
 
 def test_network_optimizations():
     """Teste les optimisations réseau"""
@@ -141,7 +309,9 @@ def test_network_optimizations():
         server_thread = threading.Thread(target=server.start, daemon=True)
         server_thread.start()
         
-        time.sleep(0.5)  # Laisser le serveur démarrer
+        # Attendre que le socket soit en écoute (ou que le démarrage échoue)
+        if not server.ready.wait(timeout=5.0):
+            print("⚠️ Le serveur n'a pas démarré dans les 5 secondes")
         
         if server.running:
             print("✅ Serveur optimisé créé avec succès")
@@ -166,6 +336,122 @@ def test_network_optimizations():
             
     except Exception as e:
         print(f"❌ Erreur test réseau: {e}")
+    
+    # Comparaison TCP / UDP sur la boucle locale
+    try:
+        import numpy as np
+        
+        payload = b'\x00' * (AudioConfig.DEFAULT['CHUNK'] * 2)  # Un chunk audio int16
+        round_trips = 10_000
+        
+        lines = [f"\n📡 Aller-retour TCP vs UDP ({len(payload)} bytes, {round_trips} échanges)"]
+        for transport in ("TCP", "UDP"):
+            rtts_ns, lost = measure_transport_rtt(transport, payload, round_trips)
+            p50, p95, p99, p999 = np.percentile(rtts_ns, [50, 95, 99, 99.9]) / 1000
+            lines.append(f"   {transport}: p50={p50:.1f}µs p95={p95:.1f}µs p99={p99:.1f}µs "
+                         f"p99.9={p999:.1f}µs" + (f", {lost} perdus" if lost else ""))
+        sys.stdout.write("\n".join(lines) + "\n")
+            
+    except Exception as e:
+        print(f"❌ Erreur comparaison TCP/UDP: {e}")
+
+def measure_transport_rtt(transport, payload, round_trips):
+    """Mesure les allers-retours d'un paquet vers un serveur écho local (TCP ou UDP)
+    
+    Returns:
+        (durées des allers-retours en ns sous forme de tableau numpy, paquets perdus)
+    """
+    import socket
+    import numpy as np
+    
+    size = len(payload)
+    rtts = np.empty(round_trips, dtype=np.int64)
+    count = 0
+    lost = 0
+    
+    if transport == "UDP":
+        server_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server_sock.bind(('127.0.0.1', 0))
+        address = server_sock.getsockname()
+        
+        def echo():
+            while True:
+                data, peer = server_sock.recvfrom(65536)
+                if not data:  # Datagramme vide: fin du test
+                    break
+                server_sock.sendto(data, peer)
+        
+        echo_thread = threading.Thread(target=echo, daemon=True)
+        echo_thread.start()
+        
+        client_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        client_sock.settimeout(1.0)
+        try:
+            for _ in range(round_trips):
+                start_ns = time.perf_counter_ns()
+                client_sock.sendto(payload, address)
+                try:
+                    client_sock.recvfrom(65536)
+                except socket.timeout:
+                    lost += 1
+                    continue
+                rtts[count] = time.perf_counter_ns() - start_ns
+                count += 1
+            client_sock.sendto(b'', address)
+        finally:
+            echo_thread.join(timeout=1.0)
+            client_sock.close()
+            server_sock.close()
+    else:
+        listen_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listen_sock.bind(('127.0.0.1', 0))
+        listen_sock.listen(1)
+        
+        def recv_exact(sock, length):
+            data = b''
+            while len(data) < length:
+                part = sock.recv(length - len(data))
+                if not part:
+                    return None
+                data += part
+            return data
+        
+        def configure(sock):
+            # Même réglages que le client/serveur vocal: pas de Nagle, buffers d'un chunk
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, size)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+        
+        def echo():
+            conn, _ = listen_sock.accept()
+            configure(conn)
+            with conn:
+                while True:
+                    data = recv_exact(conn, size)
+                    if data is None:
+                        break
+                    conn.sendall(data)
+        
+        echo_thread = threading.Thread(target=echo, daemon=True)
+        echo_thread.start()
+        
+        client_sock = socket.create_connection(listen_sock.getsockname())
+        configure(client_sock)
+        try:
+            for _ in range(round_trips):
+                start_ns = time.perf_counter_ns()
+                client_sock.sendall(payload)
+                if recv_exact(client_sock, size) is None:
+                    lost += 1
+                    break
+                rtts[count] = time.perf_counter_ns() - start_ns
+                count += 1
+        finally:
+            client_sock.close()
+            echo_thread.join(timeout=1.0)
+            listen_sock.close()
+    
+    return rtts[:count], lost
 
 def performance_summary():
     """Résumé des performances attendues"""
@@ -5,9 +5,7 @@ Test du système de logging de LanVoice
 import sys
 import os
 import time
-
-# Ajouter le dossier src au path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+import argparse
 
 def test_logging_system():
     """Test complet du système de logging"""
@@ -17,7 +15,7 @@ def test_logging_system():
     
     try:
         # Initialiser le logging
-        from logger import init_logging, get_logger, log_startup_complete
+        from src.logger import init_logging, get_logger, log_startup_complete
         
         print("1. Initialisation du système de logging...")
         logger_system = init_logging()
@@ -75,41 +73,53 @@ def show_log_content():
             print("❌ Aucun dossier de logs trouvé")
             return
         
-        # Trouver le fichier de log le plus récent
-        log_files = [f for f in os.listdir(logs_dir) if f.startswith("lanvoice_") and f.endswith(".log")]
-        if not log_files:
+        # Trouver le fichier de log le plus récent (stat mise en cache par DirEntry)
+        with os.scandir(logs_dir) as entries:
+            latest_log = max((e for e in entries if e.name.startswith("lanvoice_") and e.name.endswith(".log")),
+                             key=lambda e: e.stat().st_ctime, default=None)
+        if latest_log is None:
             print("❌ Aucun fichier de log trouvé")
             return
         
-        latest_log = max(log_files, key=lambda f: os.path.getctime(os.path.join(logs_dir, f)))
-        log_path = os.path.join(logs_dir, latest_log)
-        
-        print(f"\n📄 Contenu du log: {latest_log}")
+        print(f"\n📄 Contenu du log: {latest_log.name}")
         print("=" * 60)
         
-        with open(log_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            print(content)
+        # Lecture ligne par ligne: le log n'est pas chargé entièrement en mémoire
+        with open(latest_log.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                sys.stdout.write(line)
         
         print("=" * 60)
-        print(f"📊 Taille du fichier: {os.path.getsize(log_path)} bytes")
+        print(f"📊 Taille du fichier: {latest_log.stat().st_size} bytes")
         
     except Exception as e:
         print(f"❌ Erreur lecture du log: {e}")
 
-def main():
+def parse_args(argv=None):
+    """Options de ligne de commande (aucune interaction requise, ex. en CI)"""
+    parser = argparse.ArgumentParser(description="Test du système de logging LanVoice")
+    parser.add_argument('--show-log', action='store_true',
+                        help="affiche le contenu du log créé")
+    parser.add_argument('--no-wait', action='store_true', default=bool(os.environ.get('CI')),
+                        help="ne pas attendre Entrée à la fin (par défaut si CI est défini)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Fonction principale de test"""
+    args = parse_args(argv)
     success = test_logging_system()
     
-    if success:
-        print("\n" + "=" * 60)
-        choice = input("Voulez-vous voir le contenu du log créé ? (o/n): ").lower().strip()
+    if success and args.show_log:
+        # Les records passent par une file: la vider avant de relire le fichier
+        from src.logger import stop_logging
+        stop_logging()
         
-        if choice in ['o', 'oui', 'y', 'yes']:
-            show_log_content()
+        print("\n" + "=" * 60)
+        show_log_content()
     
-    input("\nAppuyez sur Entrée pour continuer...")
+    if not args.no_wait:
+        input("\nAppuyez sur Entrée pour continuer...")
     return success
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(0 if main() else 1)
\ No newline at end of file
@@ -5,12 +5,7 @@ Ce script teste différents scénarios d'erreur pour vérifier que les messages
 
 import socket
 import threading
-import time
 import sys
-import os
-
-# Ajouter le dossier src au path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 try:
     from src.server import VoiceServer
@@ -35,14 +30,16 @@ def test_verbose_errors():
     print("-" * 30)
     
     try:
-        # Créer un socket qui va bloquer le port
+        # Créer un socket qui va bloquer un port libre attribué par le système
         blocking_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        blocking_socket.bind(('0.0.0.0', 12345))
+        blocking_socket.bind(('127.0.0.1', 0))
         blocking_socket.listen(1)
-        print("✅ Socket bloquant créé sur le port 12345")
+        port = blocking_socket.getsockname()[1]
+        print(f"✅ Socket bloquant créé sur le port {port}")
         
         # Essayer de créer un serveur sur le même port
-        server = VoiceServer(host="0.0.0.0", port=12345)
+        server = VoiceServer(host="127.0.0.1", port=port)
+        server.port = port  # Le port enregistré dans la configuration est prioritaire sinon
         try:
             server.start()
             print("❌ Le serveur aurait dû échouer!")
@@ -99,17 +96,21 @@ def test_verbose_errors():
     print("-" * 30)
     
     try:
-        server = VoiceServer(host="127.0.0.1", port=12346)  # Port différent
+        server = VoiceServer(host="127.0.0.1")
+        server.port = 0  # Port libre attribué par le système
         server_thread = threading.Thread(target=server.start, daemon=True)
         server_thread.start()
         
-        time.sleep(0.5)  # Laisser le temps au serveur de démarrer
+        # Attendre que le socket soit en écoute (ou que le démarrage échoue)
+        if not server.ready.wait(timeout=5.0):
+            print("⚠️ Le serveur n'a pas démarré dans les 5 secondes")
         
         if server.running:
-            print("✅ Serveur démarré avec succès sur le port 12346")
+            port = server.socket.getsockname()[1]
+            print(f"✅ Serveur démarré avec succès sur le port {port}")
             
             # Tester la connexion client
-            client = VoiceClient(host="127.0.0.1", port=12346)
+            client = VoiceClient(host="127.0.0.1", port=port)
             if client.connect():
                 print("✅ Client connecté avec succès")
                 client.disconnect()
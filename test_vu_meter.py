@@ -7,135 +7,203 @@ import os
 import time
 import threading
 
-# Ajouter le dossier src au path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+# Animation visuelle (pauses, affichage du niveau) et attentes de la touche Entrée
+# seulement en mode interactif: sinon le script tourne sans surveillance (CI)
+INTERACTIVE = os.environ.get("LANVOICE_TEST_INTERACTIVE") == "1"
 
+# Dépendances vérifiées au lancement: l'import du module reste possible sans numpy
 try:
     import numpy as np
-    from client import VoiceClient
+    from src.client import VoiceClient
+    from src.dsp import rms_int16_batch
+except ImportError as e:
+    np = None
+    _IMPORT_ERROR = e
+
+def rms_db_batch(frames):
+    """Niveaux RMS en dB (plancher -60 dB) de tous les blocs d'une matrice (F, N) int16"""
+    rms = rms_int16_batch(np.ascontiguousarray(frames))
+    with np.errstate(divide='ignore'):
+        db = 20 * np.log10(rms / 32767.0)
+    return np.maximum(db, -60.0)
+
+def signal_with_rms(amplitude, n=1024):
+    """Signal carré ±amplitude de n échantillons int16, dont le RMS vaut exactement amplitude"""
+    buf = np.empty(n, dtype=np.int16)
+    buf[0::2] = amplitude
+    buf[1::2] = -amplitude
+    return buf
+
+def test_vu_meter():
+    """Test du VU-mètre avec des données audio simulées"""
+    print("🧪 Test du VU-mètre...")
     
-    def test_vu_meter():
-        """Test du VU-mètre avec des données audio simulées"""
-        print("🧪 Test du VU-mètre...")
-        
-        client = VoiceClient()
-        
-        # Callback pour afficher le niveau
-        def level_callback(level):
-            bars = "█" * int(level / 5)  # Barre visuelle
-            print(f"\rNiveau: {level:5.1f}% |{bars:<20}|", end="", flush=True)
-        
-        # Callback pour afficher l'état VOX
-        def vox_callback(active):
-            status = "🔊 ACTIF" if active else "🔇 INACTIF"
-            print(f" VOX: {status}")
-        
-        client.level_callback = level_callback
-        client.vox_callback = vox_callback
+    client = VoiceClient.for_testing()
+    
+    # Préchauffer le noyau RMS pour ne pas mesurer la compilation au premier bloc
+    client.calculate_rms_level(np.zeros(1024, dtype=np.int16))
+    
+    # Écriture directe sur le descripteur de la console: un seul os.write
+    # par ligne, sans flush synchrone à chaque bloc
+    try:
+        stdout_fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        stdout_fd = None
+    stdout_encoding = sys.stdout.encoding or 'utf-8'
+    
+    def write_console(text):
+        if stdout_fd is None:
+            sys.stdout.write(text)
+        else:
+            os.write(stdout_fd, text.encode(stdout_encoding, 'replace'))
+    
+    # Callback pour afficher le niveau
+    def level_callback(level):
+        if not INTERACTIVE:
+            return
+        bars = "█" * int((level + 60) / 3)  # Barre visuelle (-60 dB à 0 dB sur 20 cases)
+        write_console(f"\rNiveau: {level:5.1f} dB |{bars:<20}|")
+    
+    # Callback pour afficher l'état VOX
+    def vox_callback(active):
+        status = "🔊 ACTIF" if active else "🔇 INACTIF"
+        write_console(f" VOX: {status}\n")
+    
+    client.level_callback = level_callback
+    client.vox_callback = vox_callback
+    
+    # Simuler différents niveaux audio
+    test_levels = [0, 10, 20, 30, 40, 20, 5, 0]
+    
+    # Blocs simulés générés une seule fois par niveau et réutilisés pour chaque seuil:
+    # un carré ±A a un RMS exactement égal à A, d'où un niveau attendu connu
+    amplitudes = {level: int(32767 * (level / 100)) for level in set(test_levels)}
+    frames = {level: signal_with_rms(amplitude) for level, amplitude in amplitudes.items()}
+    
+    # Niveaux de toute la séquence calculés en un seul appel vectorisé
+    trace = np.stack([frames[level] for level in test_levels])
+    levels = rms_db_batch(trace)
+    
+    # Le calcul groupé doit concorder avec celui du client
+    expected = [client.calculate_rms_level(frames[level]) for level in test_levels]
+    np.testing.assert_allclose(levels, expected, atol=0.01)
+    
+    # Et correspondre au niveau théorique du signal (plancher -60 dB pour le silence)
+    with np.errstate(divide='ignore'):
+        theoretical = np.maximum(20 * np.log10(np.array([amplitudes[level] for level in test_levels]) / 32767.0), -60.0)
+    np.testing.assert_allclose(levels, theoretical, atol=0.01)
+    
+    # Seuils en dB placés entre les niveaux des signaux carrés (silence -60 dB, 5% ≈ -26 dB,
+    # 10% ≈ -20 dB, 20% ≈ -14 dB, 30% ≈ -10.5 dB, 40% ≈ -8 dB) et état VOX attendu par bloc
+    expected_active = {
+        -40.0: [False, True, True, True, True, True, True, False],
+        -17.0: [False, False, True, True, True, True, False, False],
+        -9.0: [False, False, False, False, True, False, False, False],
+    }
+    
+    for threshold, expected in expected_active.items():
+        # Vider le tampon de print avant les écritures directes pour garder l'ordre
+        print(f"\n--- Test avec seuil {threshold:.0f} dB ---", flush=True)
+        client.set_threshold(threshold)
+        client.set_vox_enabled(True)
         
-        # Tester avec différents niveaux de threshold
-        thresholds = [5, 15, 25]
+        # Simuler la logique VOX: transitions détectées sur toute la séquence
+        # (l'état précédent sert de valeur initiale pour le front du premier bloc)
+        active = levels > threshold
+        np.testing.assert_array_equal(active, expected, err_msg=f"État VOX inattendu pour le seuil {threshold} dB")
+        last_state = getattr(client, '_last_vox_state', False)
+        transitions = set(np.flatnonzero(np.diff(active.astype(np.int8), prepend=np.int8(last_state))).tolist())
         
-        for threshold in thresholds:
-            print(f"\n--- Test avec seuil {threshold}% ---")
-            client.set_threshold(threshold)
-            client.set_vox_enabled(True)
+        for index, calculated_level in enumerate(levels.tolist()):
+            # Afficher le niveau précalculé
+            client.audio_level = calculated_level
+            assert client.should_transmit_audio() == active[index], \
+                f"VOX devrait être {'actif' if active[index] else 'inactif'} à {calculated_level:.1f} dB (seuil {threshold} dB)"
             
-            # Simuler différents niveaux audio
-            test_levels = [0, 10, 20, 30, 40, 20, 5, 0]
+            level_callback(calculated_level)
+            if index in transitions:
+                vox_callback(bool(active[index]))
             
-            for level in test_levels:
-                # Simuler des données audio correspondant au niveau
-                if level > 0:
-                    # Créer un signal audio simulé
-                    amplitude = int(32767 * (level / 100))
-                    audio_data = np.random.randint(-amplitude, amplitude, 1024, dtype=np.int16).tobytes()
-                else:
-                    # Silence
-                    audio_data = np.zeros(1024, dtype=np.int16).tobytes()
-                
-                # Calculer et afficher le niveau
-                calculated_level = client.calculate_rms_level(audio_data)
-                client.audio_level = calculated_level
-                
-                # Simuler la logique VOX
-                should_transmit = client.should_transmit_audio()
-                vox_active = calculated_level > threshold
-                
-                if level_callback:
-                    level_callback(calculated_level)
-                if vox_callback and vox_active != getattr(client, '_last_vox_state', False):
-                    vox_callback(vox_active)
-                    client._last_vox_state = vox_active
-                
+            if INTERACTIVE:
                 time.sleep(0.5)
-            
-            print("\n" + "="*50)
-        
-        print("\n✅ Test du VU-mètre terminé")
-        return True
-
-    def test_threshold_logic():
-        """Test de la logique de threshold"""
-        print("\n🧪 Test de la logique de threshold...")
-        
-        client = VoiceClient()
-        
-        # Test mode manuel
-        client.set_vox_enabled(False)
-        client.recording = True
-        assert client.should_transmit_audio() == True, "Mode manuel devrait transmettre quand recording=True"
         
-        client.recording = False
-        assert client.should_transmit_audio() == False, "Mode manuel ne devrait pas transmettre quand recording=False"
+        if len(active):
+            client._last_vox_state = bool(active[-1])
         
-        # Test mode VOX
-        client.set_vox_enabled(True)
-        client.set_threshold(15)
-        
-        client.audio_level = 10
-        assert client.should_transmit_audio() == False, "VOX ne devrait pas transmettre sous le seuil"
-        
-        client.audio_level = 20
-        assert client.should_transmit_audio() == True, "VOX devrait transmettre au-dessus du seuil"
-        
-        print("✅ Logique de threshold OK")
-        return True
+        print("\n" + "="*50)
+    
+    print("\n✅ Test du VU-mètre terminé")
+    return True
+
+def test_threshold_logic():
+    """Test de la logique de threshold"""
+    print("\n🧪 Test de la logique de threshold...")
+    
+    client = VoiceClient.for_testing()
+    
+    # Test mode manuel
+    client.set_vox_enabled(False)
+    client.recording = True
+    assert client.should_transmit_audio() == True, "Mode manuel devrait transmettre quand recording=True"
+    
+    client.recording = False
+    assert client.should_transmit_audio() == False, "Mode manuel ne devrait pas transmettre quand recording=False"
+    
+    # Test mode VOX
+    client.set_vox_enabled(True)
+    client.set_threshold(-30)
+    
+    # Balayage des niveaux (dB) autour du seuil, vérifié en une seule comparaison
+    levels = np.array([-50, -40, -30, -20, -10, 0], dtype=np.float64)
+    expected = levels > -30
+    
+    def set_and_check(level):
+        client.audio_level = level
+        return client.should_transmit_audio()
+    
+    got = np.fromiter((set_and_check(level) for level in levels.tolist()), dtype=bool, count=len(levels))
+    np.testing.assert_array_equal(got, expected, err_msg="VOX devrait transmettre seulement au-dessus du seuil")
+    
+    print("✅ Logique de threshold OK")
+    return True
 
-    def main():
-        """Lance les tests du VU-mètre et threshold"""
-        print("=" * 50)
-        print("🎚️ Test VU-mètre et Threshold")
-        print("=" * 50)
+def main():
+    """Lance les tests du VU-mètre et threshold"""
+    print("=" * 50)
+    print("🎚️ Test VU-mètre et Threshold")
+    print("=" * 50)
+    
+    try:
+        # Test de la logique
+        if not test_threshold_logic():
+            return False
         
-        try:
-            # Test de la logique
-            if not test_threshold_logic():
-                return False
-            
-            # Test visuel du VU-mètre
+        # Test visuel du VU-mètre
+        if INTERACTIVE:
             print("\nAppuyez sur Entrée pour lancer le test visuel du VU-mètre...")
             input()
-            
-            if not test_vu_meter():
-                return False
-            
-            print("\n🎉 Tous les tests sont passés!")
-            return True
-            
-        except Exception as e:
-            print(f"\n❌ Erreur lors des tests: {e}")
-            import traceback
-            traceback.print_exc()
+        
+        if not test_vu_meter():
             return False
+        
+        print("\n🎉 Tous les tests sont passés!")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Erreur lors des tests: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
 
-    if __name__ == "__main__":
-        success = main()
+if __name__ == "__main__":
+    if np is None:
+        print(f"❌ Dépendance manquante: {_IMPORT_ERROR}")
+        print("Installez numpy avec: pip install numpy")
+        if INTERACTIVE:
+            input("Appuyez sur Entrée pour continuer...")
+        sys.exit(1)
+    
+    success = main()
+    if INTERACTIVE:
         input("\nAppuyez sur Entrée pour continuer...")
-        sys.exit(0 if success else 1)
-
-except ImportError as e:
-    print(f"❌ Dépendance manquante: {e}")
-    print("Installez numpy avec: pip install numpy")
-    input("Appuyez sur Entrée pour continuer...")
-    sys.exit(1)
\ No newline at end of file
+    sys.exit(0 if success else 1)